@@ -5,87 +5,60 @@
 
 
 # Libraries
-from typing import Optional, List
+from typing import Optional, Any, AsyncIterator, Callable, Dict, Iterable, List, TextIO, Tuple
 import argparse
 import asyncio
+import contextvars
 import logging
+import os
+import subprocess
 import sys
 import re
+from concurrent.futures import ThreadPoolExecutor
 from urllib.parse import urlparse
 from random import choice
+from time import perf_counter
 
+from lib.cache import http_cache
 from lib.const import BOARDS_DESC, METHODS_DESC
-from lib.bp_interface import InternetGameInterface
-
-# Popular chess
-from lib.bp_lichess import InternetGameLichess
-from lib.bp_chesscom import InternetGameChessCom
-# Chess
-from lib.bp_2700chess import InternetGame2700chess
-from lib.bp_365chess import InternetGame365chess
-from lib.bp_chessarena import InternetGameChessarena
-from lib.bp_chessbase import InternetGameChessbase
-from lib.bp_chessbomb import InternetGameChessbomb
-# TODO ChessDuo.com
-from lib.bp_chessgames import InternetGameChessgames
-from lib.bp_chessking import InternetGameChessking
-from lib.bp_chessorg import InternetGameChessOrg
-from lib.bp_chesspastebin import InternetGameChesspastebin
-from lib.bp_chesspro import InternetGameChesspro
-from lib.bp_chesspuzzle import InternetGameChesspuzzle
-from lib.bp_chessresults import InternetGameChessresults
-from lib.bp_chesssamara import InternetGameChesssamara
-from lib.bp_chesstempo import InternetGameChesstempo
-from lib.bp_chessvariants import InternetGameChessvariants
-from lib.bp_chessvsgpt import InternetGameChessvsgpt
-from lib.bp_echecsonline import InternetGameEchecsonline
-from lib.bp_europeechecs import InternetGameEuropeechecs
-from lib.bp_ficgs import InternetGameFicgs
-from lib.bp_ficsgames import InternetGameFicsgames
-from lib.bp_gameknot import InternetGameGameknot
-from lib.bp_gchess import InternetGameGchess
-from lib.bp_greenchess import InternetGameGreenchess
-from lib.bp_iccf import InternetGameIccf
-from lib.bp_immortal import InternetGameImmortal
-from lib.bp_ideachess import InternetGameIdeachess
-from lib.bp_lishogi import InternetGameLishogi
-from lib.bp_listudy import InternetGameListudy
-from lib.bp_livechessaunz import InternetGameLivechessAunz
-from lib.bp_livechesscloud import InternetGameLivechesscloud
-from lib.bp_mskchess import InternetGameMskchess
-from lib.bp_playok import InternetGamePlayokChess
-from lib.bp_playstrategy import InternetGamePlaystrategy
-from lib.bp_pychess import InternetGamePychess
-from lib.bp_redhotpawn import InternetGameRedhotpawn
-from lib.bp_schacharena import InternetGameSchacharena
-from lib.bp_schachspielen import InternetGameSchachspielen
-from lib.bp_schemingmind import InternetGameSchemingmind
-from lib.bp_thechessworld import InternetGameThechessworld
-# Draughts
-from lib.bp_lidraughts import InternetGameLidraughts
-from lib.bp_playok import InternetGamePlayokDraughts8, InternetGamePlayokDraughts10
-# Go
-from lib.bp_dragongoserver import InternetGameDragongoserver
-from lib.bp_gokgs import InternetGameGokgs
-from lib.bp_ingoweb import InternetGameIngoweb
-from lib.bp_onlinego import InternetGameOnlinego
-from lib.bp_playok import InternetGamePlayokGo, InternetGamePlayokGomoku
-# Mill
-from lib.bp_playok import InternetGamePlayokMill
-# Lowest priority
-from lib.bp_generic_chess import InternetGameGenericChess
-
-board_providers: List[InternetGameInterface] = []
+from lib.bp_interface import InternetGameInterface, InternetGameJob
+from lib.manifest import PROVIDERS
+from lib.deadline import InternetDeadline, current_deadline
+from lib.router import InternetGameRouter
+from lib.throttle import throttle
+from lib.transport import http_session
+
+# The board providers are loaded on demand from the manifest
+router = InternetGameRouter(PROVIDERS)
+regexes = {'lichess_game': re.compile(r'^[a-z0-9-]{8}$', re.IGNORECASE),
+           'lichess_puzzle': re.compile(r'^[a-z0-9]{5}$', re.IGNORECASE)}
+
+# Threads of the synchronous board providers, separate from the default executor used by aiohttp for the DNS
+executor = ThreadPoolExecutor(max_workers=8, thread_name_prefix='boards')
+
+# Delay in seconds before the next board provider is tried in parallel of the pending one, None to try them one by one
+hedge_delay: Optional[float] = None
+
+
+# Run a blocking function without freezing the event loop
+async def run_sync(func: Callable, *args: Any) -> Any:
+    ctx = contextvars.copy_context()                                    # The deadline of the download is kept
+    return await asyncio.get_running_loop().run_in_executor(executor, ctx.run, func, *args)
 
 
 # Retrieve a game from a URL
-async def download(url: str) -> Optional[str]:
+async def download(url: str, timeout: Optional[float] = None) -> Optional[str]:
+    return (await retrieve(url, timeout))[1]
+
+
+# Complete the popular identifiers into a URL, else None if the URL is not valid
+def normalize(url: str) -> Optional[str]:
     # Recognize the most popular identifiers
     if url in [None, '']:
         return None
-    if re.compile(r'^[a-z0-9-]{8}$', re.IGNORECASE).match(url) is not None:
+    if regexes['lichess_game'].match(url) is not None:
         url = 'https://lichess.org/' + url
-    elif re.compile(r'^[a-z0-9]{5}$', re.IGNORECASE).match(url) is not None:
+    elif regexes['lichess_puzzle'].match(url) is not None:
         url = 'https://lichess.org/training/' + url
     elif url.isdigit():
         url = 'https://www.chess.com/live/game/' + url
@@ -94,45 +67,280 @@ async def download(url: str) -> Optional[str]:
     p = urlparse(url.strip())
     if '' in [p.scheme, p.netloc]:
         return None
+    return url
+
+
+# Retrieve a game from a URL with the board provider that responded
+async def retrieve(url: str, timeout: Optional[float] = None) -> Tuple[Optional[InternetGameInterface], Optional[str]]:
+    url = normalize(url)
+    if url is None:
+        return None, None
     logging.debug('URL to retrieve: %s', url)
 
-    # Call the board providers
-    for bp in board_providers:
+    # Call the board providers within the deadline
+    token = current_deadline.set(InternetDeadline(timeout))
+    try:
+        return await asyncio.wait_for(submit(url), timeout)
+    except asyncio.TimeoutError:
+        logging.debug('Deadline exceeded')
+        return None, None
+    finally:
+        current_deadline.reset(token)
+
+
+# Submit a valid URL to the board providers, from the most specific to the most generic
+async def submit(url: str) -> Tuple[Optional[InternetGameInterface], Optional[str]]:
+    async def _attempt(bp: InternetGameInterface, job: InternetGameJob) -> Optional[str]:
+        # Download
+        logging.debug('Responding board provider: %s', bp.get_description())
+        try:
+            if bp.is_async():
+                pgn = await bp.download_game(job)
+            else:
+                pgn = await run_sync(bp.download_game, job)
+            pgn = await run_sync(bp.sanitize, pgn)
+        except Exception as e:
+            pgn = None
+            logging.debug(str(e))
+
+        # Check
+        if pgn is None:
+            logging.debug('Download failed: %s', bp.get_description())
+        else:
+            logging.debug('Successful download')
+        return pgn
+
+    # Board providers accepting the URL
+    jobs = []
+    for bp in router.candidates(url):
+        if bp.is_enabled():
+            job = bp.assign_game(url)
+            if job is not None:
+                jobs.append((bp, job))
+
+    # The next board provider starts when the pending one failed, or meanwhile after the hedge delay
+    tasks: List[asyncio.Future] = []
+    try:
+        current = 0
+        while current < len(jobs):
+            if len(tasks) == current:
+                if current_deadline.get().expired():
+                    break
+                tasks.append(asyncio.ensure_future(_attempt(*jobs[current])))
+            hedging = (hedge_delay is not None) and (len(tasks) < len(jobs))
+            await asyncio.wait([tasks[current]], timeout=hedge_delay if hedging else None)
+            if not tasks[current].done():
+                logging.debug('Hedging with the next board provider')
+                tasks.append(asyncio.ensure_future(_attempt(*jobs[len(tasks)])))
+                continue
+            pgn = tasks[current].result()
+            if pgn is not None:
+                return jobs[current][0], pgn
+            current += 1
+        return None, None
+    finally:
+        for task in tasks:
+            task.cancel()
+
+
+# Write the games of a URL to the SINK as they are downloaded, and return their number with the completion of the export
+# The number None is returned if no board provider can stream the URL or if the export failed before the first game
+async def stream(url: str, sink: TextIO, timeout: Optional[float] = None) -> Tuple[Optional[int], bool]:
+    url = normalize(url)
+    if url is None:
+        return None, False
+    for bp in router.candidates(url):
         if not bp.is_enabled():
             continue
-        bp.reset()
-        if bp.assign_game(url):
-            # Download
-            logging.debug('Responding board provider: %s', bp.get_description())
-            try:
-                if bp.is_async():
-                    pgn = await bp.download_game()
-                else:
-                    pgn = bp.download_game()
+        job = bp.assign_game(url)
+        if job is None:
+            continue
+        games = bp.stream_game(job)
+        if games is None:
+            return None, False
+
+        # The deadline only bounds the connection and every read, as an export can be long
+        count = 0
+        token = current_deadline.set(InternetDeadline(timeout))
+        try:
+            while True:
+                pgn = await run_sync(next, games, None)
+                if pgn is None:
+                    break
                 pgn = bp.sanitize(pgn)
+                if pgn is not None:
+                    sink.write(pgn + '\n\n')
+                    sink.flush()
+                    count += 1
+        except Exception as e:
+            logging.error('The export of %s failed after %d games: %s', url, count, str(e))
+            return (None if count == 0 else count), False
+        finally:
+            current_deadline.reset(token)
+            try:
+                games.close()                                           # Release the connection
+            except ValueError:
+                pass
+        return count, True
+    return None, False
+
+
+# Retrieve several games concurrently, in the order of the URL or as soon as they are available
+async def download_batch(urls: List[str], concurrency: int, ordered: bool, timeout: Optional[float] = None) -> AsyncIterator[Tuple[str, Optional[InternetGameInterface], Optional[str]]]:
+    semaphore = asyncio.Semaphore(max(1, concurrency))
+
+    # Group the games that the board providers download at once
+    groups: Dict[InternetGameInterface, List[Tuple[int, InternetGameJob]]] = {}
+    for i, url in enumerate(urls):
+        nurl = normalize(url)
+        if nurl is None:
+            continue
+        for bp in router.candidates(nurl):
+            if not bp.is_enabled():
+                continue
+            job = bp.assign_game(nurl)
+            if job is not None:
+                if not bp.is_async() and bp.can_bulk(job):
+                    groups.setdefault(bp, []).append((i, job))
+                break
+    bulks: Dict[int, Tuple[InternetGameInterface, asyncio.Future, int]] = {}
+    for bp, items in groups.items():
+        if len(items) > 1:
+            logging.debug('Bulk download of %d games: %s', len(items), bp.get_description())
+            lock = asyncio.Lock()                                       # One chunk at a time per board provider
+            for c in range(0, len(items), bp.bulk_size):
+                chunk = items[c:c + bp.bulk_size]
+                future = asyncio.ensure_future(_download_bulk(bp, [job for _, job in chunk], lock, semaphore, timeout))
+                for k, (i, _) in enumerate(chunk):
+                    bulks[i] = (bp, future, k)
+
+    async def _download(i: int, url: str) -> Tuple[str, Optional[InternetGameInterface], Optional[str]]:
+        # Game of a bulk download
+        if i in bulks:
+            bp, future, k = bulks[i]
+            pgn = (await asyncio.shield(future))[k]
+            if pgn is not None:
+                pgn = await run_sync(bp.sanitize, pgn)
+                if pgn is not None:
+                    return url, bp, pgn
+
+        # Single download, also for the games missing in the bulk download
+        async with semaphore:
+            try:
+                return (url, *await retrieve(url, timeout))
             except Exception as e:
-                pgn = None
                 logging.debug(str(e))
+                return url, None, None
 
-            # Check
-            if pgn is None:
-                logging.debug('Download failed')
-            else:
-                logging.debug('Successful download')
-                return pgn
-    return None
+    tasks = [asyncio.ensure_future(_download(i, url)) for i, url in enumerate(urls)]
+    try:
+        for task in (tasks if ordered else asyncio.as_completed(tasks)):
+            yield await task
+    finally:
+        for task in tasks:
+            task.cancel()
+        for _, future, _ in bulks.values():
+            future.cancel()
+
+
+# Download several games of a board provider at once, with None for the failures
+# The timeout applies to every chunk of the bulk download, as the chunks of a board provider are sent one after another
+async def _download_bulk(bp: InternetGameInterface, jobs: List[InternetGameJob], lock: asyncio.Lock, semaphore: asyncio.Semaphore,
+                         timeout: Optional[float] = None) -> List[Optional[str]]:
+    async with lock, semaphore:
+        token = current_deadline.set(InternetDeadline(timeout))
+        try:
+            results = await asyncio.wait_for(run_sync(bp.download_bulk, jobs), timeout)
+        except Exception as e:
+            logging.warning('Bulk download of %d games failed, downloading them one by one: %s', len(jobs), str(e) or type(e).__name__)
+            return [None] * len(jobs)
+        finally:
+            current_deadline.reset(token)
+    missing = sum(1 for pgn in results if pgn is None)
+    if missing > 0:
+        logging.warning('%d of %d games missing from the bulk download, downloading them one by one', missing, len(jobs))
+    return results
+
+
+# Print the new and changed games of a live event until it is over
+async def follow(url: str, interval: float, timeout: Optional[float] = None) -> bool:
+    url = normalize(url)
+    if url is None:
+        return False
+    for bp in router.candidates(url):
+        if not bp.is_enabled():
+            continue
+        job = bp.assign_game(url)
+        if job is None:
+            continue
+        state: Dict = {}
+        while True:
+            # Poll within the deadline
+            token = current_deadline.set(InternetDeadline(timeout))
+            try:
+                games = await run_sync(bp.follow_game, job, state)
+            except Exception as e:
+                logging.debug(str(e))
+                games = []
+            finally:
+                current_deadline.reset(token)
+
+            # Output
+            if games is None:
+                if len(state) == 0:
+                    break                                               # Not supported by the board provider
+                logging.info('End of the event')
+                return True
+            for pgn in games:
+                pgn = await run_sync(bp.sanitize, pgn)
+                if pgn is not None:
+                    print(pgn, end='\n\n', flush=True)
+            await asyncio.sleep(interval)
+    return False
+
+
+# Local HTTP server keeping the board providers loaded between the requests
+async def serve(host: str, port: int, concurrency: int, timeout: Optional[float] = None) -> None:
+    from aiohttp import web
+
+    def _result(url: str, bp: Optional[InternetGameInterface], data: Optional[str]) -> Dict:
+        result: Dict = {'url': url, 'data': data}
+        if bp is not None:
+            site, board, method = bp.get_identity()
+            result.update({'site': site, 'board': BOARDS_DESC[board], 'method': METHODS_DESC[method]})
+        return result
+
+    async def _download(request: web.Request) -> web.Response:
+        url = request.query.get('url', '').strip()
+        bp, data = await retrieve(url, timeout)
+        return web.json_response(_result(url, bp, data), status=404 if data is None else 200)
+
+    async def _batch(request: web.Request) -> web.Response:
+        try:
+            urls = (await request.json())['urls']
+            if not isinstance(urls, list) or not all(isinstance(url, str) for url in urls):
+                raise ValueError
+        except Exception:
+            return web.json_response({'error': 'Expected JSON: {"urls": ["https://..."]}'}, status=400)
+        results = [_result(*r) async for r in download_batch([url.strip() for url in urls], concurrency, True, timeout)]
+        return web.json_response(results)
+
+    app = web.Application()
+    app.add_routes([web.get('/download', _download),
+                    web.post('/batch', _batch)])
+    runner = web.AppRunner(app)
+    await runner.setup()
+    try:
+        await web.TCPSite(runner, host, port).start()
+        logging.info('Listening on http://%s:%d', host, port)
+        await asyncio.Event().wait()
+    finally:
+        await runner.cleanup()
+        await shutdown()
 
 
 # Start of the program
 async def main() -> None:
-    # Load the board providers from the imported classes
-    for cls in InternetGameInterface.__subclasses__():
-        if len(cls.__subclasses__()) == 0:
-            board_providers.append(cls())
-        else:
-            for cls2 in cls.__subclasses__():
-                board_providers.append(cls2())
-
     # General Unicode
     try:
         sys.stdout.reconfigure(encoding='utf-8')
@@ -145,44 +353,130 @@ async def main() -> None:
 
     subparser.add_parser('show', help='Show the supported board providers')
 
-    group = subparser.add_parser('download', help='Download a game')
+    network = argparse.ArgumentParser(add_help=False)
+    network.add_argument('--unverified-ssl', action='store_true', help='Use an unverified SSL context to avoid some errors with SSL')
+    network.add_argument('--no-cache', action='store_true', help='Bypass the cache of the HTTP responses')
+    network.add_argument('--clear-cache', action='store_true', help='Empty the cache of the HTTP responses before starting')
+    network.add_argument('--timeout', type=float, default=None, help='Maximal duration in seconds of the download of a game, unlimited by default')
+    network.add_argument('--workers', type=int, default=8, help='Number of simultaneous downloads of the synchronous board providers, each of them using up to 8 more threads for its own requests')
+    network.add_argument('--rate', type=float, default=8.0, help='Maximal number of requests per second and per host, 0 for no limit')
+    network.add_argument('--in-flight', type=int, default=4, help='Maximal number of simultaneous requests per host')
+    network.add_argument('--hedge', type=float, default=None, metavar='SECONDS', help='Try the next board provider in parallel when the previous one did not answer within SECONDS')
+    network.add_argument('--host-limit', action='append', default=[], metavar='HOST=RATE/IN_FLIGHT', help='Specific limits of a host and its subdomains, for example "lichess.org=2/2"')
+
+    group = subparser.add_parser('download', help='Download a game', parents=[network])
     group.add_argument('url', default='', help='URL of the board game')
-    group.add_argument('--unverified-ssl', action='store_true', help='Use an unverified SSL context to avoid some errors with SSL')
+    group.add_argument('--output', default='', help='File to write the games to, else the standard output')
+
+    group = subparser.add_parser('batch', help='Download several games', parents=[network])
+    group.add_argument('file', nargs='?', default='-', help='File with one URL per line, or "-" for the standard input')
+    group.add_argument('--concurrency', type=int, default=8, help='Maximal number of simultaneous downloads')
+    group.add_argument('--unordered', action='store_true', help='Output the games as soon as they are downloaded instead of the order of the URL')
 
-    subparser.add_parser('test', help='Run the quality test')
+    group = subparser.add_parser('serve', help='Run a local HTTP server to download the games', parents=[network])
+    group.add_argument('--host', default='127.0.0.1', help='Listening address, local by default')
+    group.add_argument('--port', type=int, default=8000, help='Listening port')
+    group.add_argument('--concurrency', type=int, default=8, help='Maximal number of simultaneous downloads per batch')
+
+    group = subparser.add_parser('follow', help='Output the new and changed games of a live event', parents=[network])
+    group.add_argument('url', default='', help='URL of the live event')
+    group.add_argument('--interval', type=float, default=60.0, help='Delay in seconds between the polls')
+
+    group = subparser.add_parser('test', help='Run the quality test')
+    group.add_argument('--workers', type=int, default=8, help='Number of simultaneous downloads of the synchronous board providers, each of them using up to 8 more threads for its own requests')
+
+    group = subparser.add_parser('bench', help='Run the offline benchmarks')
+    group.add_argument('target', nargs='?', choices=['routing', 'import'], default='routing', help='Resolution of the URL or import time of the modules')
+    group.add_argument('--rounds', type=int, default=100, help='Number of iterations')
 
     # Execute
     parser = cmdline.parse_args()
+    if getattr(parser, 'workers', None) is not None:
+        global executor
+        executor = ThreadPoolExecutor(max_workers=max(1, parser.workers), thread_name_prefix='boards')
     if parser.command == 'show':
         plist = []
-        for bp in board_providers:
-            if bp.is_enabled():
-                site, board, method = bp.get_identity()
-                plist.append('%s - %s [%s]' % (BOARDS_DESC[board], site, METHODS_DESC[method]))
+        for _, _, site, board, method, _ in PROVIDERS:
+            plist.append('%s - %s [%s]' % (BOARDS_DESC[board], site, METHODS_DESC[method]))
         plist.sort()
         for bp in plist:
             print(bp)
 
-    elif parser.command == 'download':
+    elif parser.command in ['download', 'batch', 'serve', 'follow']:
         # SSL
         if parser.unverified_ssl:
             import ssl
             ssl._create_default_https_context = ssl._create_unverified_context
 
+        # Cache
+        if parser.clear_cache:
+            http_cache.clear()
+        http_cache.enabled = not parser.no_cache
+
+        # Hedged requests
+        global hedge_delay
+        hedge_delay = parser.hedge
+
+        # Limits per host
+        throttle.configure('*', parser.rate, parser.in_flight)
+        for spec in parser.host_limit:
+            m = re.match(r'^([^=]+)=([0-9.]+)(?:/([0-9]+))?$', spec.strip())
+            if m is None:
+                cmdline.error('invalid host limit: %s' % spec)
+            throttle.configure(m.group(1), float(m.group(2)), parser.in_flight if m.group(3) is None else int(m.group(3)))
+
         # Download
-        data = await download(parser.url)
-        if data is not None:
-            print(data)
+        if parser.command == 'serve':
+            logging.basicConfig(level=logging.INFO)
+            await serve(parser.host, parser.port, parser.concurrency, parser.timeout)
+        elif parser.command == 'follow':
+            logging.basicConfig(level=logging.INFO)
+            if not await follow(parser.url, parser.interval, parser.timeout):
+                logging.error('The live event cannot be followed.')
+        elif parser.command == 'download':
+            sink = open(parser.output, 'w', encoding='utf-8') if parser.output != '' else sys.stdout
+            try:
+                count, complete = await stream(parser.url, sink, parser.timeout)
+                if count is None:
+                    data = await download(parser.url, parser.timeout)
+                    if data is not None:
+                        print(data, file=sink)
+                        count, complete = 1, True
+                if not count:
+                    logging.error('No game found.')
+                elif not complete:
+                    logging.error('The export is incomplete: only %d games were written.', count)
+            finally:
+                if sink is not sys.stdout:
+                    sink.close()
         else:
-            logging.error('No game found.')
+            if parser.file == '-':
+                lines = sys.stdin.readlines()
+            else:
+                with open(parser.file, 'r', encoding='utf-8') as f:
+                    lines = f.readlines()
+            urls = [line.strip() for line in lines if (line.strip() != '') and not line.strip().startswith('#')]
+            failures = 0
+            async for url, _, data in download_batch(urls, parser.concurrency, not parser.unordered, parser.timeout):
+                if data is not None:
+                    print(data, end='\n\n', flush=True)
+                else:
+                    logging.error('No game found: %s', url)
+                    failures += 1
+            if failures > 0:
+                logging.error('%d of %d downloads failed', failures, len(urls))
 
     elif parser.command == 'test':
         logging.basicConfig(stream=sys.stdout, level=logging.DEBUG)
+        http_cache.enabled = False                                      # The sites must be reached
         errors = 0
-        for bp in board_providers:
+        for bp, entry in zip(router.providers(), PROVIDERS):
             # Check
             if bp is None:
                 continue
+            if (list(bp.get_identity()) != list(entry[2:5])) or (bp.get_hosts() != entry[5]):
+                logging.error('The manifest does not match the board provider %s', entry[1])
+                errors += 1
             logging.info('================')
             logging.info('Site: %s', bp.get_description())
             links = bp.get_test_links()
@@ -199,16 +493,16 @@ async def main() -> None:
             logging.info('Expecting data: %s', expected)
 
             # Download link
-            bp.reset()
-            if not bp.assign_game(url):
+            job = bp.assign_game(url)
+            if job is None:
                 data = None
             else:
                 try:
                     if bp.is_async():
-                        data = await bp.download_game()
+                        data = await bp.download_game(job)
                     else:
-                        data = bp.download_game()
-                    data = bp.sanitize(data)
+                        data = await run_sync(bp.download_game, job)
+                    data = await run_sync(bp.sanitize, data)
                 except Exception as e:
                     logging.debug(str(e))
                     data = None
@@ -227,9 +521,76 @@ async def main() -> None:
         else:
             logging.info('The unit test is successful')
 
+    elif parser.command == 'bench' and parser.target == 'routing':
+        # Resolution of the URL until a dedicated board provider accepts it, as the fallback providers accept any URL
+        def _resolve(providers: Iterable[InternetGameInterface], url: str) -> Optional[InternetGameInterface]:
+            for bp in providers:
+                if (bp.assign_game(url) is not None) and (bp.get_hosts() != ['*']):
+                    return bp
+            return None
+
+        board_providers = router.providers()
+        links = [url for bp in board_providers for url, _ in bp.get_test_links() if urlparse(url).netloc != '']
+        results = {}
+        for name, candidates in [('Linear scan', lambda url: board_providers),
+                                 ('Router', router.candidates)]:
+            start = perf_counter()
+            for _ in range(max(1, parser.rounds)):
+                for url in links:
+                    results[(name, url)] = _resolve(candidates(url), url)
+            elapsed = perf_counter() - start
+            print('%s: %d URL in %.3f s, %.0f URL/s' % (name, len(links) * max(1, parser.rounds), elapsed, len(links) * max(1, parser.rounds) / elapsed))
+
+        # Both techniques must elect the same board providers
+        for url in links:
+            if results[('Linear scan', url)] is not results[('Router', url)]:
+                logging.error('Different board providers for %s', url)
+
+    elif parser.command == 'bench' and parser.target == 'import':
+        # Import time of a download from Lichess in a fresh interpreter, as reported by "python -X importtime"
+        script = ('import boards\n'
+                  'url = "https://lichess.org/CA4bR2b8"\n'
+                  'next(bp for bp in boards.router.candidates(url) if bp.assign_game(url) is not None)\n')
+        timings: Dict[str, List[int]] = {}
+        modules = set()
+        for _ in range(max(1, parser.rounds)):
+            proc = subprocess.run([sys.executable, '-X', 'importtime', '-c', script], cwd=os.path.dirname(os.path.abspath(__file__)), capture_output=True, text=True)
+            for line in proc.stderr.splitlines():
+                m = re.match(r'^import time:\s+(\d+) \|\s+(\d+) \| (\s*)(\S+)$', line)
+                if m is not None:
+                    modules.add(m.group(4))
+                    if m.group(3) == '':                                                        # Top-level modules only
+                        timings.setdefault(m.group(4), []).append(int(m.group(2)))
+        total = sum(min(t) for t in timings.values())
+        print('Import time: %.1f ms for %d top-level modules' % (total / 1000, len(timings)))
+        for name, t in sorted(timings.items(), key=lambda x: -min(x[1]))[:10]:
+            print('  %8.1f ms  %s' % (min(t) / 1000, name))
+
+        # The heavy dependencies are not expected for a game from Lichess
+        for name in ['chess', 'aiohttp']:
+            if name in modules:
+                logging.error('Unexpected import of the module "%s"', name)
+
     else:
         cmdline.print_help()
 
 
+# Release the resources of the board providers and the shared HTTP session before the end of the event loop
+async def shutdown() -> None:
+    for bp in router.loaded():
+        try:
+            await bp.shutdown()
+        except Exception as e:
+            logging.debug(str(e))
+    await http_session.close()
+
+
+async def run() -> None:
+    try:
+        await main()
+    finally:
+        await shutdown()
+
+
 if __name__ == '__main__':
-    asyncio.run(main())
+    asyncio.run(run())
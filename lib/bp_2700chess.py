@@ -7,7 +7,7 @@ from typing import Optional, List, Tuple
 from urllib.parse import urlparse, parse_qs
 
 from lib.const import BOARD_CHESS, METHOD_HTML
-from lib.bp_interface import InternetGameInterface
+from lib.bp_interface import InternetGameInterface, InternetGameJob
 
 
 # 2700chess.com
@@ -15,30 +15,32 @@ class InternetGame2700chess(InternetGameInterface):
     def get_identity(self) -> Tuple[str, int, int]:
         return '2700chess.com', BOARD_CHESS, METHOD_HTML
 
-    def assign_game(self, url: str) -> bool:
+    def get_hosts(self) -> List[str]:
+        return ['2700chess.com']
+
+    def assign_game(self, url: str) -> Optional[InternetGameJob]:
         # Verify the hostname
         parsed = urlparse(url)
         if parsed.netloc.lower() not in ['www.2700chess.com', '2700chess.com']:
-            return False
+            return None
 
         # Refactor the direct link
         if parsed.path.lower() == '/games/download':
             args = parse_qs(parsed.query)
             if 'slug' in args:
-                self.id = 'https://2700chess.com/games/%s' % args['slug'][0]
-                return True
+                return self.new_job(url, 'https://2700chess.com/games/%s' % args['slug'][0])
 
         # Verify the path
         if parsed.path.startswith('/games/'):
-            self.id = url
-            return True
-        return False
+            return self.new_job(url, url)
+        return None
 
-    def download_game(self) -> Optional[str]:
+    def download_game(self, job: Optional[InternetGameJob] = None) -> Optional[str]:
         # Download
-        if self.id is None:
+        job = job or self.last_job
+        if job is None:
             return None
-        page = self.download(self.id)
+        page = self.download(job.id)
         if page is None:
             return None
 
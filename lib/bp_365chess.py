@@ -8,7 +8,7 @@ import re
 from urllib.parse import urlparse, parse_qs
 
 from lib.const import BOARD_CHESS, METHOD_HTML
-from lib.bp_interface import InternetGameInterface
+from lib.bp_interface import InternetGameInterface, InternetGameJob
 
 
 # 365chess.com
@@ -20,33 +20,36 @@ class InternetGame365chess(InternetGameInterface):
     def get_identity(self) -> Tuple[str, int, int]:
         return '365chess.com', BOARD_CHESS, METHOD_HTML
 
-    def assign_game(self, url: str) -> bool:
+    def get_hosts(self) -> List[str]:
+        return ['365chess.com']
+
+    def assign_game(self, url: str) -> Optional[InternetGameJob]:
         # Verify the URL
         parsed = urlparse(url)
         if parsed.netloc.lower() not in ['www.365chess.com', '365chess.com']:
-            return False
+            return None
         ppl = parsed.path.lower()
         if ppl == '/game.php':
             key = 'gid'
         elif ppl == '/view_game.php':
             key = 'g'
         else:
-            return False
+            return None
 
         # Read the arguments
         args = parse_qs(parsed.query)
         if key in args:
             gid = args[key][0]
             if gid.isdigit() and gid != '0':
-                self.id = gid
-                return True
-        return False
+                return self.new_job(url, gid)
+        return None
 
-    def download_game(self) -> Optional[str]:
+    def download_game(self, job: Optional[InternetGameJob] = None) -> Optional[str]:
         # Download
-        if self.id is None:
+        job = job or self.last_job
+        if job is None:
             return None
-        url = 'https://www.365chess.com/game.php?gid=%s' % self.id
+        url = 'https://www.365chess.com/game.php?gid=%s' % job.id
         page = self.download(url)
         if page is None:
             return None
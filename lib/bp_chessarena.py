@@ -7,7 +7,7 @@ import re
 from urllib.parse import urlparse
 
 from lib.const import BOARD_CHESS, METHOD_DL
-from lib.bp_interface import InternetGameInterface
+from lib.bp_interface import InternetGameInterface, InternetGameJob
 
 
 # ChessArena.com
@@ -19,22 +19,25 @@ class InternetGameChessarena(InternetGameInterface):
     def get_identity(self) -> Tuple[str, int, int]:
         return 'ChessArena.com', BOARD_CHESS, METHOD_DL
 
-    def assign_game(self, url: str) -> bool:
+    def get_hosts(self) -> List[str]:
+        return ['chessarena.com']
+
+    def assign_game(self, url: str) -> Optional[InternetGameJob]:
         # Verify the hostname
         parsed = urlparse(url)
         if parsed.netloc.lower() not in ['www.chessarena.com', 'chessarena.com']:
-            return False
+            return None
 
         # Verify the identifier
         m = self.regexes['id'].search(url)
         if m is not None:
-            self.id = m.group(1)
-            return True
-        return False
+            return self.new_job(url, m.group(1))
+        return None
 
-    def download_game(self) -> Optional[str]:
-        if self.id is not None:
-            return self.download('https://api.worldchess.com/api/online/gaming/%s/pgn/' % self.id)
+    def download_game(self, job: Optional[InternetGameJob] = None) -> Optional[str]:
+        job = job or self.last_job
+        if job is not None:
+            return self.download('https://api.worldchess.com/api/online/gaming/%s/pgn/' % job.id)
         return None
 
     def get_test_links(self) -> List[Tuple[str, bool]]:
@@ -7,7 +7,7 @@ from typing import Optional, List, Tuple
 from html.parser import HTMLParser
 
 from lib.const import BOARD_CHESS, METHOD_HTML
-from lib.bp_interface import InternetGameInterface
+from lib.bp_interface import InternetGameInterface, InternetGameJob
 
 
 # Chessbase
@@ -15,14 +15,18 @@ class InternetGameChessbase(InternetGameInterface):
     def get_identity(self) -> Tuple[str, int, int]:
         return 'ChessBase.com', BOARD_CHESS, METHOD_HTML
 
-    def assign_game(self, url: str) -> bool:
+    def get_hosts(self) -> List[str]:
+        return ['*']
+
+    def assign_game(self, url: str) -> Optional[InternetGameJob]:
         return self.reacts_to(url, '*')             # Any website can embed a widget from Chessbase
 
-    def download_game(self) -> Optional[str]:
+    def download_game(self, job: Optional[InternetGameJob] = None) -> Optional[str]:
         # Download
-        if self.id is None:
+        job = job or self.last_job
+        if job is None:
             return None
-        page = self.download(self.id)
+        page = self.download(job.id)
         if page is None:
             return None
 
@@ -60,7 +64,7 @@ class InternetGameChessbase(InternetGameInterface):
         parser.feed(page)
         if parser.pgn is not None:
             return parser.pgn
-        parser.links = self.expand_links(parser.links, self.id)
+        parser.links = self.expand_links(parser.links, job.id)
         return self.download_list(parser.links)
 
     def get_test_links(self) -> List[Tuple[str, bool]]:
@@ -6,7 +6,7 @@ from typing import Optional, List, Tuple
 from urllib.parse import urlparse
 
 from lib.const import BOARD_CHESS, METHOD_API
-from lib.bp_interface import InternetGameInterface
+from lib.bp_interface import InternetGameInterface, InternetGameJob
 
 
 # ChessBomb.com (merged into Chess.com)
@@ -14,20 +14,23 @@ class InternetGameChessbomb(InternetGameInterface):
     def get_identity(self) -> Tuple[str, int, int]:
         return 'ChessBomb.com', BOARD_CHESS, METHOD_API
 
-    def assign_game(self, url: str) -> bool:
+    def get_hosts(self) -> List[str]:
+        return ['chess.com', 'chessbomb.com']
+
+    def assign_game(self, url: str) -> Optional[InternetGameJob]:
         parsed = urlparse(url)
         if parsed.netloc in ['chess.com', 'www.chess.com', 'nxt.chessbomb.com']:
             gid = parsed.path.replace('/api/game/', '/')
             if gid[:8] == '/events/':
-                self.id = gid
-                return True
-        return False
+                return self.new_job(url, gid)
+        return None
 
-    def download_game(self) -> Optional[str]:
+    def download_game(self, job: Optional[InternetGameJob] = None) -> Optional[str]:
         # Get the JSON
-        if self.id is None:
+        job = job or self.last_job
+        if job is None:
             return None
-        url = 'https://nxt.chessbomb.com/events/api/game/%s' % self.id[8:]
+        url = 'https://nxt.chessbomb.com/events/api/game/%s' % job.id[8:]
         bourne = self.send_xhr(url, {})     # {} = POST
         if bourne is None:
             return None
@@ -35,7 +38,7 @@ class InternetGameChessbomb(InternetGameInterface):
 
         # Interpret the JSON
         game = {}
-        game['_url'] = 'https://www.chess.com' + self.id
+        game['_url'] = 'https://www.chess.com' + job.id
         game['Event'] = self.json_field(data, 'room/name')
         game['Site'] = self.json_field(data, 'room/officialUrl')
         game['Date'] = self.json_field(data, 'game/startAt')[:10]
@@ -11,7 +11,7 @@ import chess
 from chess.variant import CrazyhouseBoard
 
 from lib.const import BOARD_CHESS, METHOD_MISC, CHESS960, TYPE_FEN
-from lib.bp_interface import InternetGameInterface
+from lib.bp_interface import InternetGameInterface, InternetGameJob
 
 
 # Chess.com
@@ -24,7 +24,10 @@ class InternetGameChessCom(InternetGameInterface):
     def get_identity(self) -> Tuple[str, int, int]:
         return 'Chess.com', BOARD_CHESS, METHOD_MISC
 
-    def assign_game(self, url: str) -> bool:
+    def get_hosts(self) -> List[str]:
+        return ['chess.com']
+
+    def assign_game(self, url: str) -> Optional[InternetGameJob]:
         # Positions
         parsed = urlparse(url)
         if parsed.netloc.lower() in ['www.chess.com', 'chess.com']:
@@ -32,25 +35,19 @@ class InternetGameChessCom(InternetGameInterface):
             if 'fen' in args:
                 fen = args['fen'][0]
                 if self.is_fen(fen):
-                    self.url_type = TYPE_FEN
-                    self.id = fen
-                    return True
+                    return self.new_job(url, fen, TYPE_FEN)
 
         # Puzzles
         m = self.regexes['puzzle'].match(url)
         if m is not None:
-            self.url_type = m.group(3).lower()
-            self.id = m.group(4)
-            return True
+            return self.new_job(url, m.group(4), m.group(3).lower())
 
         # Games
         url = url.replace('/live#g=', '/live/game/').replace('/daily#g=', '/daily/game/').replace('/computer#g=', '/computer/game/')
         m = self.regexes['game'].match(url)
         if m is not None:
-            self.url_type = m.group(3).lower()
-            self.id = m.group(5)
-            return True
-        return False
+            return self.new_job(url, m.group(5), m.group(3).lower())
+        return None
 
     def decode_move(self, move):
         # Mapping
@@ -71,18 +68,19 @@ class InternetGameChessCom(InternetGameInterface):
         sTo = mapping[posTo % 8] + str((posTo // 8 + 1))
         return '%s%s%s%s' % (sDrop, sFrom, sTo, sPromo)
 
-    def download_game(self) -> Optional[str]:
+    def download_game(self, job: Optional[InternetGameJob] = None) -> Optional[str]:
         # Check
-        if None in [self.id, self.url_type]:
+        job = job or self.last_job
+        if job is None:
             return None
 
         # Positions
-        if self.url_type == TYPE_FEN:
-            return '[Site "chess.com"]\n[White "%s"]\n[Black "%s"]\n[SetUp "1"]\n[FEN "%s"]\n\n*' % ('White', 'Black', self.id)
+        if job.url_type == TYPE_FEN:
+            return '[Site "chess.com"]\n[White "%s"]\n[Black "%s"]\n[SetUp "1"]\n[FEN "%s"]\n\n*' % ('White', 'Black', job.id)
 
         # Puzzles
-        if self.url_type == 'puzzles':
-            url = 'https://www.chess.com/puzzles/problem/%s' % self.id
+        if job.url_type == 'puzzles':
+            url = 'https://www.chess.com/puzzles/problem/%s' % job.id
             page = self.download(url)
             if page is None:
                 return None
@@ -150,7 +148,7 @@ class InternetGameChessCom(InternetGameInterface):
         # Games
         else:
             # API since October 2020
-            url = 'https://www.chess.com/callback/%s/game/%s' % (self.url_type, self.id)
+            url = 'https://www.chess.com/callback/%s/game/%s' % (job.url_type, job.id)
             url = url.replace('callback/computer', 'computer/callback')
             bourne = self.send_xhr(url, {})
             if bourne is None:
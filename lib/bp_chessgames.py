@@ -7,55 +7,42 @@ from typing import Optional, List, Tuple
 from urllib.parse import urlparse, parse_qs
 
 from lib.const import BOARD_CHESS, METHOD_DL
-from lib.bp_interface import InternetGameInterface
+from lib.bp_interface import InternetGameInterface, InternetGameJob
 
 
 # ChessGames.com
 class InternetGameChessgames(InternetGameInterface):
-    def reset(self):
-        InternetGameInterface.reset(self)
-        self.computer = False
-
     def get_identity(self) -> Tuple[str, int, int]:
         return 'ChessGames.com', BOARD_CHESS, METHOD_DL
 
-    def assign_game(self, url: str) -> bool:
+    def get_hosts(self) -> List[str]:
+        return ['chessgames.com']
+
+    def assign_game(self, url: str) -> Optional[InternetGameJob]:
         # Verify the hostname
         parsed = urlparse(url)
         if parsed.netloc.lower() not in ['www.chessgames.com', 'chessgames.com']:
-            return False
+            return None
 
         # Read the arguments
         args = parse_qs(parsed.query)
         if 'gid' in args:
             gid = args['gid'][0]
             if gid.isdigit() and gid != '0':
-                self.id = gid
-                self.computer = ('comp' in args) and (args['comp'][0] == '1')
-                return True
-        return False
+                return self.new_job(url, gid, computer=('comp' in args) and (args['comp'][0] == '1'))
+        return None
 
-    def download_game(self) -> Optional[str]:
+    def download_game(self, job: Optional[InternetGameJob] = None) -> Optional[str]:
         # Check
-        if self.id is None:
+        job = job or self.last_job
+        if job is None:
             return None
 
-        # First try with computer analysis
-        url = 'http://www.chessgames.com/pgn/chessdl.pgn?gid=' + self.id
-        if self.computer:
-            pgn = self.download(url + '&comp=1')
-            if pgn in [None, ''] or 'NO SUCH GAME' in pgn:
-                self.computer = False
-            else:
-                return pgn
-
-        # Second try without computer analysis
-        if not self.computer:
-            pgn = self.download(url)
-            if pgn in [None, ''] or 'NO SUCH GAME' in pgn:
-                return None
-            return pgn
-        return None
+        # Computer analysis if requested, else the plain game that is also fetched in case the analysis is missing
+        url = 'http://www.chessgames.com/pgn/chessdl.pgn?gid=' + job.id
+        links = [url + '&comp=1', url] if job.extra.get('computer', False) else [url]
+        return self.hedge([lambda link=link: self.download(link) for link in links],
+                          lambda pgn: pgn not in [None, ''] and 'NO SUCH GAME' not in pgn)
 
     def get_test_links(self) -> List[Tuple[str, bool]]:
         return [('http://www.chessgames.com/perl/chessgame?gid=1075462&comp=1', True),              # With computer analysis
@@ -7,7 +7,7 @@ from typing import Optional, List, Tuple
 import re
 
 from lib.const import BOARD_CHESS, METHOD_DL
-from lib.bp_interface import InternetGameInterface
+from lib.bp_interface import InternetGameInterface, InternetGameJob
 
 
 # ChessKing.com
@@ -19,29 +19,28 @@ class InternetGameChessking(InternetGameInterface):
     def get_identity(self) -> Tuple[str, int, int]:
         return 'ChessKing.com', BOARD_CHESS, METHOD_DL
 
-    def assign_game(self, url: str) -> bool:
+    def get_hosts(self) -> List[str]:
+        return ['chessking.com']
+
+    def assign_game(self, url: str) -> Optional[InternetGameJob]:
         m = self.regexes['url'].match(url)
         if m is not None:
             gid = str(m.group(3))
             if gid.isdigit() and gid != '0' and len(gid) <= 9:
-                if m.group(2) == 'ff/':
-                    self.url_type = 'f'
-                else:
-                    self.url_type = 'g'
-                self.id = gid
-                return True
-        return False
-
-    def download_game(self) -> Optional[str]:
+                return self.new_job(url, gid, 'f' if m.group(2) == 'ff/' else 'g')
+        return None
+
+    def download_game(self, job: Optional[InternetGameJob] = None) -> Optional[str]:
         # Check
-        if None in [self.url_type, self.id]:
+        job = job or self.last_job
+        if job is None:
             return None
 
         # Download
-        gid = self.id
+        gid = job.id
         while len(gid) < 9:
             gid = '0%s' % gid
-        url = 'https://c1.chessking.com/pgn/%s/%s/%s/%s%s.pgn' % (self.url_type, gid[:3], gid[3:6], self.url_type, gid)
+        url = 'https://c1.chessking.com/pgn/%s/%s/%s/%s%s.pgn' % (job.url_type, gid[:3], gid[3:6], job.url_type, gid)
         return self.download(url)
 
     def get_test_links(self) -> List[Tuple[str, bool]]:
@@ -10,7 +10,7 @@ from random import choice, randint
 import chess
 
 from lib.const import BOARD_CHESS, METHOD_WS, CHESS960
-from lib.bp_interface import InternetGameInterface
+from lib.bp_interface import InternetGameInterface, InternetGameJob
 from lib.ws import InternetWebsockets
 
 
@@ -23,14 +23,16 @@ class InternetGameChessOrg(InternetGameInterface):
     def get_identity(self) -> Tuple[str, int, int]:
         return 'Chess.org', BOARD_CHESS, METHOD_WS
 
-    def assign_game(self, url: str) -> bool:
+    def get_hosts(self) -> List[str]:
+        return ['chess.org']
+
+    def assign_game(self, url: str) -> Optional[InternetGameJob]:
         m = self.regexes['url'].match(url)
         if m is not None:
             gid = str(m.group(1))
             if len(gid) == 36:
-                self.id = gid
-                return True
-        return False
+                return self.new_job(url, gid)
+        return None
 
     def fix_fen(self, fen):
         flist = fen.split(' ')
@@ -38,14 +40,15 @@ class InternetGameChessOrg(InternetGameInterface):
         flist[2] = t[0] + t[2] + t[1] + t[3]
         return ' '.join(flist)
 
-    async def download_game(self) -> Optional[str]:
+    async def download_game(self, job: Optional[InternetGameJob] = None) -> Optional[str]:
         # Check
-        if self.id is None:
+        job = job or self.last_job
+        if job is None:
             return None
 
         # Fetch the page to retrieve the encrypted user name
-        url = 'https://chess.org/play/%s' % self.id
-        page = self.download(url)
+        url = 'https://chess.org/play/%s' % job.id
+        page = await self.download_async(url)
         if page is None:
             return None
         lines = page.split("\n")
@@ -69,19 +72,16 @@ class InternetGameChessOrg(InternetGameInterface):
         ws = await InternetWebsockets().connect('wss://chess.org:443/play-sockjs/%d/%s/websocket' % (rndI, rndS))
         try:
             # Server: Hello
-            async for data in ws.recv():
-                if data != 'o':  # Open
-                    await ws.close()
-                    return None
+            if await ws.recv() != 'o':  # Open
+                return None
 
             # Client: I am XXX, please open the game YYY
-            await ws.send('["%s %s"]' % (name, self.id))
+            await ws.send('["%s %s"]' % (name, job.id))
 
             # Server: some data
-            async for data in ws.recv():
-                if data[:1] != 'a':
-                    await ws.close()
-                    return None
+            data = await ws.recv()
+            if (data is None) or (data[:1] != 'a'):
+                return None
             data = data[3:-2]
         finally:
             await ws.close()
@@ -8,7 +8,7 @@ import re
 from html.parser import HTMLParser
 
 from lib.const import BOARD_CHESS, METHOD_HTML
-from lib.bp_interface import InternetGameInterface
+from lib.bp_interface import InternetGameInterface, InternetGameJob
 
 
 # ChessPastebin.com
@@ -20,14 +20,18 @@ class InternetGameChesspastebin(InternetGameInterface):
     def get_identity(self) -> Tuple[str, int, int]:
         return 'ChessPastebin.com', BOARD_CHESS, METHOD_HTML
 
-    def assign_game(self, url: str) -> bool:
+    def get_hosts(self) -> List[str]:
+        return ['chesspastebin.com']
+
+    def assign_game(self, url: str) -> Optional[InternetGameJob]:
         return self.reacts_to(url, 'chesspastebin.com')
 
-    def download_game(self) -> Optional[str]:
+    def download_game(self, job: Optional[InternetGameJob] = None) -> Optional[str]:
         # Download
-        if self.id is None:
+        job = job or self.last_job
+        if job is None:
             return None
-        page = self.download(self.id)
+        page = self.download(job.id)
         if page is None:
             return None
 
@@ -7,7 +7,7 @@ from typing import Optional, List, Tuple
 import re
 
 from lib.const import BOARD_CHESS, METHOD_HTML
-from lib.bp_interface import InternetGameInterface
+from lib.bp_interface import InternetGameInterface, InternetGameJob
 
 
 # ChessPro.ru
@@ -19,16 +19,20 @@ class InternetGameChesspro(InternetGameInterface):
     def get_identity(self) -> Tuple[str, int, int]:
         return 'ChessPro.ru', BOARD_CHESS, METHOD_HTML
 
-    def assign_game(self, url: str) -> bool:
+    def get_hosts(self) -> List[str]:
+        return ['chesspro.ru']
+
+    def assign_game(self, url: str) -> Optional[InternetGameJob]:
         return self.reacts_to(url, 'chesspro.ru')
 
-    def download_game(self) -> Optional[str]:
+    def download_game(self, job: Optional[InternetGameJob] = None) -> Optional[str]:
         # Check
-        if self.id is None:
+        job = job or self.last_job
+        if job is None:
             return None
 
         # Download the page
-        page = self.download(self.id)
+        page = self.download(job.id)
         if page is None:
             return None
 
@@ -8,7 +8,7 @@ import re
 from html.parser import HTMLParser
 
 from lib.const import BOARD_CHESS, METHOD_HTML
-from lib.bp_interface import InternetGameInterface
+from lib.bp_interface import InternetGameInterface, InternetGameJob
 
 
 # ChessPuzzle.net
@@ -20,22 +20,25 @@ class InternetGameChesspuzzle(InternetGameInterface):
     def get_identity(self) -> Tuple[str, int, int]:
         return 'ChessPuzzle.net', BOARD_CHESS, METHOD_HTML
 
-    def assign_game(self, url: str) -> bool:
+    def get_hosts(self) -> List[str]:
+        return ['chesspuzzle.net']
+
+    def assign_game(self, url: str) -> Optional[InternetGameJob]:
         m = self.regexes['url'].match(url)
         if m is not None:
             gid = str(m.group(3))
             if gid.isdigit() and gid != '0':
-                self.id = gid
-                return True
-        return False
+                return self.new_job(url, gid)
+        return None
 
-    def download_game(self) -> Optional[str]:
+    def download_game(self, job: Optional[InternetGameJob] = None) -> Optional[str]:
         # Check
-        if self.id is None:
+        job = job or self.last_job
+        if job is None:
             return None
 
         # Download the puzzle
-        page = self.download('https://chesspuzzle.net/Solution/%s' % self.id)
+        page = self.download('https://chesspuzzle.net/Solution/%s' % job.id)
         if page is None:
             return None
 
@@ -2,67 +2,145 @@
 # https://github.com/ecrucru/boards
 # GPL version 3
 
-from typing import Optional, List, Tuple
+from typing import Optional, Dict, List, Tuple
 from urllib.parse import urlparse
+from time import monotonic
+import logging
 import re
+import threading
 
 from lib.const import BOARD_CHESS, METHOD_HTML
-from lib.bp_interface import InternetGameInterface
+from lib.bp_interface import InternetGameInterface, InternetGameJob
 
 
 # Chess-Results.com
 class InternetGameChessresults(InternetGameInterface):
+    def __init__(self):
+        InternetGameInterface.__init__(self)
+        self.regexes.update({'id': re.compile(r'tn(o|r)=?(\d+)'),
+                             'rounds': re.compile(r'aspx\?[^"\'<>]*?[?&;]rd=(\d+)'),
+                             'state': re.compile(r'id="(__EVENTARGUMENT|__EVENTTARGET|__EVENTVALIDATION|__VIEWSTATE|__VIEWSTATEGENERATOR)" value="([^"]*)"')})
+        self.sessions: Dict[str, Tuple[float, Dict[str, str]]] = {}     # Form state of the tournaments
+        self.lock = threading.Lock()
+        self.locks: Dict[str, threading.Lock] = {}                      # One warm-up at a time per tournament
+        self.session_ttl = 600.0
+        self.rounds_per_chunk = 2                                       # Small enough to stay below the limit of 2000 games per export
+        self.chunks_per_wave = 4                                        # Chunks requested at once when the number of rounds is unknown
+
     def get_identity(self) -> Tuple[str, int, int]:
         return 'Chess-Results.com', BOARD_CHESS, METHOD_HTML
 
-    def assign_game(self, url: str) -> bool:
+    def get_hosts(self) -> List[str]:
+        return ['chess-results.com']
+
+    def assign_game(self, url: str) -> Optional[InternetGameJob]:
         # Verify the host
         parsed = urlparse(url)
         if not ('.' + parsed.netloc.lower()).endswith('.chess-results.com'):
-            return False
+            return None
 
         # Read the identifier
-        m = re.compile(r'tn(o|r)=?(\d+)').search(url)
+        m = self.regexes['id'].search(url)
         if m is not None:
-            self.id = m.group(2)
-            return True
-        return False
-
-    def download_game(self) -> Optional[str]:
-        # Payload
-        payload = {'ctl00$P1$combo_anzahl_zeilen': '5',         # 2000
-                   'ctl00$P1$cb_SuchenPartie': 'Search',
-                   'ctl00$P1$txt_von_tag': '',
-                   'ctl00$P1$txt_bis_tag': '',
-                   'ctl00$P1$txt_rdbis': '16',
-                   'ctl00$P1$txt_rdvon': '1',
-                   'ctl00$P1$txt_dbkey': self.id,
-                   'ctl00$P1$txt_bez': '',
-                   'ctl00$P1$txt_vorname': '',
-                   'ctl00$P1$Txt_FideID': '',
-                   'ctl00$P1$Txt_NatID': '',
-                   'ctl00$P1$txt_nachname': '',
-                   'ctl00$P1$combo_spielerfarbe': '-',
-                   'ctl00$P1$combo_ergebnis': '-'}
-
-        # Perform a search in 2 attempts to load the cache
-        url = 'https://s3.chess-results.com/partieSuche.aspx?lan=1&tnr=%s&art=4&rd=1' % self.id
-        for i in range(2):
+            return self.new_job(url, m.group(2))
+        return None
+
+    def get_payload(self, tid: str, first: int, last: int) -> Dict[str, str]:
+        return {'ctl00$P1$combo_anzahl_zeilen': '5',         # 2000
+                'ctl00$P1$cb_SuchenPartie': 'Search',
+                'ctl00$P1$txt_von_tag': '',
+                'ctl00$P1$txt_bis_tag': '',
+                'ctl00$P1$txt_rdbis': str(last),
+                'ctl00$P1$txt_rdvon': str(first),
+                'ctl00$P1$txt_dbkey': tid,
+                'ctl00$P1$txt_bez': '',
+                'ctl00$P1$txt_vorname': '',
+                'ctl00$P1$Txt_FideID': '',
+                'ctl00$P1$Txt_NatID': '',
+                'ctl00$P1$txt_nachname': '',
+                'ctl00$P1$combo_spielerfarbe': '-',
+                'ctl00$P1$combo_ergebnis': '-'}
+
+    def get_form_state(self, tid: str, url: str, renew: bool = False) -> Dict[str, str]:
+        ''' Return the ASP.NET form state of the tournament TID, reused between the downloads for a while. '''
+        with self.lock:
+            lock = self.locks.setdefault(tid, threading.Lock())
+        with lock:
+            if not renew and (tid in self.sessions) and (monotonic() - self.sessions[tid][0] < self.session_ttl):
+                return self.sessions[tid][1]
+
+            # Perform a search in 2 attempts to load the cache
+            payload = self.get_payload(tid, 1, self.rounds_per_chunk)
+            state: Dict[str, str] = {}
+            for i in range(2):
+                data = self.send_xhr(url, payload)
+                assert (data is not None) and ('Internal Server Error' not in data)
+                state = dict(self.regexes['state'].findall(data))
+                for t in ['__EVENTARGUMENT', '__EVENTTARGET', '__EVENTVALIDATION', '__VIEWSTATE', '__VIEWSTATEGENERATOR']:
+                    state.setdefault(t, '')
+                payload.update(state)
+            self.sessions[tid] = (monotonic(), state)
+            return state
+
+    def download_rounds(self, tid: str, url: str, first: int, last: int) -> Optional[str]:
+        ''' Download the games of the rounds FIRST to LAST.
+            An empty string is returned when the rounds have no game, and the value None in case of error. '''
+        for renew in [False, True]:
+            payload = self.get_payload(tid, first, last)
+            payload.update(self.get_form_state(tid, url, renew))
+            del payload['ctl00$P1$cb_SuchenPartie']
+            payload['ctl00$P1$cb_DownLoadPGN'] = 'Download as PGN-File'
             data = self.send_xhr(url, payload)
-            assert (data is not None) and ('Internal Server Error' not in data)
-
-            # Update the event data
-            for t in ['__EVENTARGUMENT', '__EVENTTARGET', '__EVENTVALIDATION', '__VIEWSTATE', '__VIEWSTATEGENERATOR']:
-                m = re.compile('id="%s" value="(.*)"' % t).search(data)
-                if m is not None:
-                    payload[t] = m.group(1)
-                else:
-                    payload[t] = ''
-
-        # Download the games
-        del payload['ctl00$P1$cb_SuchenPartie']
-        payload['ctl00$P1$cb_DownLoadPGN'] = 'Download as PGN-File'
-        return self.send_xhr(url, payload)
+            if (data is not None) and ('Internal Server Error' not in data):
+                if data.count('[Event ') >= 2000:
+                    logging.warning('Chess-Results.com: the rounds %d to %d of the tournament %s are truncated to 2000 games', first, last, tid)
+                return data.strip() if data.startswith('[') else ''
+        return None                                                     # Expired form state
+
+    def get_round_count(self, tid: str) -> Optional[int]:
+        ''' Return the number of rounds of the tournament TID from the links of its page, else None. '''
+        page = self.download('https://s3.chess-results.com/tnr%s.aspx?lan=1' % tid)
+        if page is None:
+            return None
+        rounds = [int(r) for r in self.regexes['rounds'].findall(page)]
+        return max(rounds) if len(rounds) > 0 else None
+
+    def download_game(self, job: Optional[InternetGameJob] = None) -> Optional[str]:
+        # Check
+        job = job or self.last_job
+        if job is None:
+            return None
+
+        # Number of rounds
+        url = 'https://s3.chess-results.com/partieSuche.aspx?lan=1&tnr=%s&art=4&rd=1' % job.id
+        self.get_form_state(job.id, url)
+        rounds = self.get_round_count(job.id)
+        if rounds is None:
+            logging.warning('Chess-Results.com: unknown number of rounds for the tournament %s, downloaded until %d rounds without game',
+                            job.id, self.rounds_per_chunk * self.chunks_per_wave)
+
+        # Download the rounds by chunks in parallel, the rounds without game being skipped
+        rpc = self.rounds_per_chunk
+        first = 1
+        chunks = []
+        while True:
+            if rounds is None:
+                firsts = [first + i * rpc for i in range(self.chunks_per_wave)]
+            else:
+                firsts = list(range(first, rounds + 1, rpc))
+            ranges = [(f, f + rpc - 1 if rounds is None else min(f + rpc - 1, rounds)) for f in firsts]
+            wave = self.map_concurrently(lambda r: self.download_rounds(job.id, url, r[0], r[1]), ranges)
+            failures = ['%d-%d' % r for r, data in zip(ranges, wave) if not isinstance(data, str)]
+            if len(failures) > 0:
+                logging.warning('Chess-Results.com: rounds %s not downloaded for the tournament %s', ', '.join(failures), job.id)
+            chunks.extend(data for data in wave if isinstance(data, str) and (data != ''))
+
+            # Next wave while the games of the last round may be missing
+            if (rounds is not None) or all(data == '' for data in wave):
+                break
+            first += len(firsts) * rpc
+        pgn = '\n\n'.join(chunks)
+        return pgn if pgn != '' else None
 
     def get_test_links(self) -> List[Tuple[str, bool]]:
         return [('https://chess-results.com/tnr424416.aspx', True),                                 # Old games
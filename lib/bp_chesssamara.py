@@ -7,7 +7,7 @@ from typing import Optional, List, Tuple
 import re
 
 from lib.const import BOARD_CHESS, METHOD_DL
-from lib.bp_interface import InternetGameInterface
+from lib.bp_interface import InternetGameInterface, InternetGameJob
 
 
 # Chess-Samara.ru
@@ -19,18 +19,21 @@ class InternetGameChesssamara(InternetGameInterface):
     def get_identity(self) -> Tuple[str, int, int]:
         return 'Chess-Samara.ru', BOARD_CHESS, METHOD_DL
 
-    def assign_game(self, url: str) -> bool:
+    def get_hosts(self) -> List[str]:
+        return ['chess-samara.ru']
+
+    def assign_game(self, url: str) -> Optional[InternetGameJob]:
         m = self.regexes['url'].match(url)
         if m is not None:
             gid = str(m.group(2))
             if gid.isdigit() and (gid != '0'):
-                self.id = gid
-                return True
-        return False
+                return self.new_job(url, gid)
+        return None
 
-    def download_game(self) -> Optional[str]:
-        if self.id is not None:
-            return self.download('https://chess-samara.ru/view/pgn.html?gameid=%s' % self.id)
+    def download_game(self, job: Optional[InternetGameJob] = None) -> Optional[str]:
+        job = job or self.last_job
+        if job is not None:
+            return self.download('https://chess-samara.ru/view/pgn.html?gameid=%s' % job.id)
         return None
 
     def get_test_links(self) -> List[Tuple[str, bool]]:
@@ -9,7 +9,7 @@ from base64 import b64decode
 import chess
 
 from lib.const import BOARD_CHESS, METHOD_WS, TYPE_GAME, TYPE_PUZZLE
-from lib.bp_interface import InternetGameInterface
+from lib.bp_interface import InternetGameInterface, InternetGameJob
 from lib.ws import InternetWebsockets
 
 
@@ -23,35 +23,35 @@ class InternetGameChesstempo(InternetGameInterface):
     def get_identity(self) -> Tuple[str, int, int]:
         return 'ChessTempo.com', BOARD_CHESS, METHOD_WS
 
-    def assign_game(self, url: str) -> bool:
+    def get_hosts(self) -> List[str]:
+        return ['chesstempo.com']
+
+    def assign_game(self, url: str) -> Optional[InternetGameJob]:
         # Puzzles
         m = self.regexes['puzzle'].match(url)
         if m is not None:
             gid = str(m.group(2))
             if gid.isdigit() and gid != '0':
-                self.id = gid
-                self.url_type = TYPE_PUZZLE
-                return True
+                return self.new_job(url, gid, TYPE_PUZZLE)
 
         # Games
         m = self.regexes['game'].match(url)
         if m is not None:
             gid = str(m.group(3))
             if gid.isdigit() and (gid != '0'):
-                self.id = gid
-                self.url_type = TYPE_GAME
-                return True
-        return False
+                return self.new_job(url, gid, TYPE_GAME)
+        return None
 
-    async def download_game(self) -> Optional[str]:
+    async def download_game(self, job: Optional[InternetGameJob] = None) -> Optional[str]:
         # Check
-        if None in [self.id, self.url_type]:
+        job = job or self.last_job
+        if job is None:
             return None
 
         # Games
-        if self.url_type == TYPE_GAME:
+        if job.url_type == TYPE_GAME:
             # Read the JSON
-            data = self.download('https://chesstempo.com/game-database/game/%s' % self.id)
+            data = await self.download_async('https://chesstempo.com/game-database/game/%s' % job.id)
             p1 = data.find('{', data.find('ct-config-data'))
             p2 = data.find('</script>', p1)
             if -1 in [p1, p2]:
@@ -99,32 +99,28 @@ class InternetGameChesstempo(InternetGameInterface):
             return self.rebuild_pgn(game)
 
         # Puzzles
-        if self.url_type == TYPE_PUZZLE:
+        if job.url_type == TYPE_PUZZLE:
 
             # Open a websocket to retrieve the puzzle
             data = None
             ws = await InternetWebsockets().connect('wss://chesstempo.com:443/ws', headers=[('User-agent', self.user_agent)])
             try:
                 # Check the welcome message
-                buffer = None
-                async for buffer in ws.recv():
-                    buffer = self.json_loads(buffer)
-                if (buffer['eventName'] == 'connectionStarted') and (buffer['data'] == 'started'):
+                buffer = self.json_loads(await ws.recv())
+                if (self.json_field(buffer, 'eventName') == 'connectionStarted') and (self.json_field(buffer, 'data') == 'started'):
 
                     # Call the puzzle
                     await ws.send('{"eventName":"get-problem-session-data","data":{"problemSetId":1,"sessionSize":20}}')
                     await ws.send('{"eventName":"set-problem-difficulty","data":{"difficulty":"","problemSetId":1}}')
-                    await ws.send('{"eventName":"get-tactic","data":{"problemId":%s,"vo":false}}' % self.id)
-
-                    for _ in range(3):
-                        async for buffer in ws.recv():
-                            buffer = self.json_loads(buffer)
-                        if buffer['eventName'] == 'get-tactic-result':
-                            if buffer['enc']:
-                                buffer = ''.join(map(lambda v: v if v < '0' or v > '9' else str((9 + int(v)) % 10), list(buffer['data'])))
-                                data = b64decode(buffer).decode().strip()
-                            else:
-                                data = buffer['data'].strip()
+                    await ws.send('{"eventName":"get-tactic","data":{"problemId":%s,"vo":false}}' % job.id)
+
+                    buffer = self.json_loads(await ws.recv_until(lambda data: self.json_field(self.json_loads(data), 'eventName') == 'get-tactic-result'))
+                    if buffer is not None:
+                        if buffer['enc']:
+                            buffer = ''.join(map(lambda v: v if v < '0' or v > '9' else str((9 + int(v)) % 10), list(buffer['data'])))
+                            data = b64decode(buffer).decode().strip()
+                        else:
+                            data = buffer['data'].strip()
             finally:
                 await ws.close()
             if data in [None, '']:
@@ -133,7 +129,7 @@ class InternetGameChesstempo(InternetGameInterface):
             # Rebuild the puzzle
             puzzle = self.json_loads(data)
             game = {}
-            game['_url'] = 'https://chesstempo.com/chess-tactics/%s' % self.id
+            game['_url'] = 'https://chesstempo.com/chess-tactics/%s' % job.id
             game['Event'] = 'Puzzle %s' % self.json_field(puzzle, 'tacticInfo/problem_id')
             game['White'] = 'White'
             game['Black'] = 'Black'
@@ -7,7 +7,7 @@ import re
 from urllib.parse import urlparse
 
 from lib.const import BOARD_CHESS, METHOD_API
-from lib.bp_interface import InternetGameInterface
+from lib.bp_interface import InternetGameInterface, InternetGameJob
 
 
 # ChessVariants.training
@@ -19,26 +19,29 @@ class InternetGameChessvariants(InternetGameInterface):
     def get_identity(self) -> Tuple[str, int, int]:
         return 'ChessVariants.training', BOARD_CHESS, METHOD_API
 
-    def assign_game(self, url: str) -> bool:
+    def get_hosts(self) -> List[str]:
+        return ['chessvariants.training']
+
+    def assign_game(self, url: str) -> Optional[InternetGameJob]:
         # Verify the hostname
         parsed = urlparse(url)
         if parsed.netloc.lower() != 'chessvariants.training':
-            return False
+            return None
 
         # Verify the identifier
         m = self.regexes['id'].search(url)
         if m is None:
-            return False
-        self.id = m.group(1)
-        return True
+            return None
+        return self.new_job(url, m.group(1))
 
-    def download_game(self) -> Optional[str]:
+    def download_game(self, job: Optional[InternetGameJob] = None) -> Optional[str]:
         # Check
-        if self.id is None:
+        job = job or self.last_job
+        if job is None:
             return None
 
         # Fetch the puzzle
-        data = {'id': self.id}
+        data = {'id': job.id}
         bourne = self.send_xhr('https://chessvariants.training/Puzzle/Train/Setup',
                                data,
                                {'Origin': 'https://chessvariants.training'})
@@ -61,7 +64,7 @@ class InternetGameChessvariants(InternetGameInterface):
         for _ in range(8):
             cfrom = self.json_field(data, 'dests/*')
             cto = self.json_field(data, 'dests/%s/[0]' % cfrom)
-            data = {'id': self.id,
+            data = {'id': job.id,
                     'trainingSessionId': session,
                     'origin': cfrom,
                     'destination': cto}
@@ -6,7 +6,7 @@ from typing import Optional, List, Tuple
 import re
 
 from lib.const import BOARD_CHESS, METHOD_API
-from lib.bp_interface import InternetGameInterface
+from lib.bp_interface import InternetGameInterface, InternetGameJob
 
 
 # ChessVsGPT.com
@@ -18,18 +18,21 @@ class InternetGameChessvsgpt(InternetGameInterface):
     def get_identity(self) -> Tuple[str, int, int]:
         return 'ChessVsGPT.com', BOARD_CHESS, METHOD_API
 
-    def assign_game(self, url: str) -> bool:
+    def get_hosts(self) -> List[str]:
+        return ['chessvsgpt.com']
+
+    def assign_game(self, url: str) -> Optional[InternetGameJob]:
         m = self.regexes['url'].match(url)
         if m is not None:
-            self.id = str(m.group(1))
-            return True
-        return False
+            return self.new_job(url, str(m.group(1)))
+        return None
 
-    def download_game(self) -> Optional[str]:
+    def download_game(self, job: Optional[InternetGameJob] = None) -> Optional[str]:
         # Qery the API
-        if self.id is None:
+        job = job or self.last_job
+        if job is None:
             return None
-        xhr = self.download('https://devapi.chessvsgpt.com/games/%s' % self.id)
+        xhr = self.download('https://devapi.chessvsgpt.com/games/%s' % job.id)
         if xhr is None:
             return None
         data = self.json_loads(xhr)
@@ -6,7 +6,7 @@ from typing import Optional, List, Tuple
 from urllib.parse import urlparse, parse_qs
 
 from lib.const import BOARD_GO, METHOD_DL
-from lib.bp_interface import InternetGameInterface
+from lib.bp_interface import InternetGameInterface, InternetGameJob
 
 
 # Dragongoserver.net
@@ -14,7 +14,10 @@ class InternetGameDragongoserver(InternetGameInterface):
     def get_identity(self) -> Tuple[str, int, int]:
         return 'DragonGoServer.net', BOARD_GO, METHOD_DL
 
-    def assign_game(self, url: str) -> bool:
+    def get_hosts(self) -> List[str]:
+        return ['dragongoserver.net']
+
+    def assign_game(self, url: str) -> Optional[InternetGameJob]:
         # Verify the URL
         parsed = urlparse(url)
         if parsed.netloc.lower() in ['www.dragongoserver.net', 'dragongoserver.net']:
@@ -23,13 +26,13 @@ class InternetGameDragongoserver(InternetGameInterface):
             if 'gid' in args:
                 gid = args['gid'][0]
                 if gid.isdigit() and gid != '0':
-                    self.id = gid
-                    return True
-        return False
+                    return self.new_job(url, gid)
+        return None
 
-    def download_game(self) -> Optional[str]:
-        if self.id is not None:
-            return self.download('https://www.dragongoserver.net/sgf.php?gid=%s' % self.id)
+    def download_game(self, job: Optional[InternetGameJob] = None) -> Optional[str]:
+        job = job or self.last_job
+        if job is not None:
+            return self.download('https://www.dragongoserver.net/sgf.php?gid=%s' % job.id)
         return None
 
     def get_test_links(self) -> List[Tuple[str, bool]]:
@@ -6,7 +6,7 @@ from typing import Optional, List, Tuple
 import re
 
 from lib.const import BOARD_CHESS, METHOD_DL
-from lib.bp_interface import InternetGameInterface
+from lib.bp_interface import InternetGameInterface, InternetGameJob
 
 
 # Echecs-Online.eu
@@ -18,17 +18,20 @@ class InternetGameEchecsonline(InternetGameInterface):
     def get_identity(self) -> Tuple[str, int, int]:
         return 'Echecs-Online.eu', BOARD_CHESS, METHOD_DL
 
-    def assign_game(self, url: str) -> bool:
+    def get_hosts(self) -> List[str]:
+        return ['echecs-online.eu']
+
+    def assign_game(self, url: str) -> Optional[InternetGameJob]:
         m = self.regexes['url'].match(url)
         if m is not None:
-            self.id = m.group(2)
-            return True
-        return False
+            return self.new_job(url, m.group(2))
+        return None
 
-    def download_game(self) -> Optional[str]:
-        if self.id is None:
+    def download_game(self, job: Optional[InternetGameJob] = None) -> Optional[str]:
+        job = job or self.last_job
+        if job is None:
             return None
-        data = self.download('https://www.echecs-online.eu/analyse/%s' % self.id)
+        data = self.download('https://www.echecs-online.eu/analyse/%s' % job.id)
         p1 = data.find('<textarea id="pgnText"')
         p2 = data.find('</textarea>', p1)
         if -1 not in [p1, p2]:
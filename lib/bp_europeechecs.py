@@ -7,7 +7,7 @@ from typing import Optional, List, Tuple
 import re
 
 from lib.const import BOARD_CHESS, METHOD_DL
-from lib.bp_interface import InternetGameInterface
+from lib.bp_interface import InternetGameInterface, InternetGameJob
 
 
 # Europe-Echecs.com
@@ -19,21 +19,25 @@ class InternetGameEuropeechecs(InternetGameInterface):
     def get_identity(self) -> Tuple[str, int, int]:
         return 'Europe-Echecs.com', BOARD_CHESS, METHOD_DL
 
-    def assign_game(self, url: str) -> bool:
+    def get_hosts(self) -> List[str]:
+        return ['europe-echecs.com']
+
+    def assign_game(self, url: str) -> Optional[InternetGameJob]:
         return self.reacts_to(url, 'europe-echecs.com')
 
-    def download_game(self) -> Optional[str]:
+    def download_game(self, job: Optional[InternetGameJob] = None) -> Optional[str]:
         # Check
-        if self.id is None:
+        job = job or self.last_job
+        if job is None:
             return None
 
         # Find the links
         links = []
-        if self.id.lower().endswith('.pgn'):
-            links.append(self.id)
+        if job.id.lower().endswith('.pgn'):
+            links.append(job.id)
         else:
             # Download the page
-            page = self.download(self.id)
+            page = self.download(job.id)
             if page is None:
                 return None
 
@@ -7,7 +7,7 @@ from typing import Optional, List, Tuple
 import re
 
 from lib.const import BOARD_CHESS, METHOD_DL
-from lib.bp_interface import InternetGameInterface
+from lib.bp_interface import InternetGameInterface, InternetGameJob
 
 
 # Ficgs.com
@@ -19,22 +19,25 @@ class InternetGameFicgs(InternetGameInterface):
     def get_identity(self) -> Tuple[str, int, int]:
         return 'Ficgs.com', BOARD_CHESS, METHOD_DL
 
-    def assign_game(self, url: str) -> bool:
+    def get_hosts(self) -> List[str]:
+        return ['ficgs.com']
+
+    def assign_game(self, url: str) -> Optional[InternetGameJob]:
         m = self.regexes['url'].match(url)
         if m is not None:
             gid = str(m.group(2))
             if gid.isdigit() and gid != '0':
-                self.id = gid
-                return True
-        return False
+                return self.new_job(url, gid)
+        return None
 
-    def download_game(self) -> Optional[str]:
+    def download_game(self, job: Optional[InternetGameJob] = None) -> Optional[str]:
         # Check
-        if self.id is None:
+        job = job or self.last_job
+        if job is None:
             return None
 
         # Download
-        return self.download('http://www.ficgs.com/game_%s.pgn' % self.id)
+        return self.download('http://www.ficgs.com/game_%s.pgn' % job.id)
 
     def get_test_links(self) -> List[Tuple[str, bool]]:
         return [('http://FICGS.com/game_95671.html', True),             # Game
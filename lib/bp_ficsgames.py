@@ -7,7 +7,7 @@ from typing import Optional, List, Tuple
 from urllib.parse import urlparse, parse_qs
 
 from lib.const import BOARD_CHESS, METHOD_DL
-from lib.bp_interface import InternetGameInterface
+from lib.bp_interface import InternetGameInterface, InternetGameJob
 
 
 # FicsGames.org
@@ -15,28 +15,31 @@ class InternetGameFicsgames(InternetGameInterface):
     def get_identity(self) -> Tuple[str, int, int]:
         return 'FicsGames.org', BOARD_CHESS, METHOD_DL
 
-    def assign_game(self, url: str) -> bool:
+    def get_hosts(self) -> List[str]:
+        return ['ficsgames.org']
+
+    def assign_game(self, url: str) -> Optional[InternetGameJob]:
         # Verify the URL
         parsed = urlparse(url)
         if parsed.netloc.lower() not in ['www.ficsgames.org', 'ficsgames.org'] or 'show' not in parsed.path.lower():
-            return False
+            return None
 
         # Read the arguments
         args = parse_qs(parsed.query)
         if 'ID' in args:
             gid = args['ID'][0]
             if gid.isdigit() and gid != '0':
-                self.id = gid
-                return True
-        return False
+                return self.new_job(url, gid)
+        return None
 
-    def download_game(self) -> Optional[str]:
+    def download_game(self, job: Optional[InternetGameJob] = None) -> Optional[str]:
         # Check
-        if self.id is None:
+        job = job or self.last_job
+        if job is None:
             return None
 
         # Download
-        pgn = self.download('http://ficsgames.org/cgi-bin/show.cgi?ID=%s;action=save' % self.id)
+        pgn = self.download('http://ficsgames.org/cgi-bin/show.cgi?ID=%s;action=save' % job.id)
         if pgn in [None, ''] or 'not found in GGbID' in pgn:
             return None
         return pgn
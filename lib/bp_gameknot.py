@@ -8,7 +8,7 @@ from urllib.parse import urlparse, parse_qs, unquote
 import chess
 
 from lib.const import BOARD_CHESS, METHOD_HTML, TYPE_GAME, TYPE_PUZZLE
-from lib.bp_interface import InternetGameInterface
+from lib.bp_interface import InternetGameInterface, InternetGameJob
 
 
 # GameKnot.com
@@ -16,11 +16,14 @@ class InternetGameGameknot(InternetGameInterface):
     def get_identity(self) -> Tuple[str, int, int]:
         return 'GameKnot.com', BOARD_CHESS, METHOD_HTML
 
-    def assign_game(self, url: str) -> bool:
+    def get_hosts(self) -> List[str]:
+        return ['gameknot.com']
+
+    def assign_game(self, url: str) -> Optional[InternetGameJob]:
         # Verify the hostname
         parsed = urlparse(url.lower())
         if parsed.netloc not in ['www.gameknot.com', 'gameknot.com']:
-            return False
+            return None
 
         # Verify the page
         if parsed.path == '/analyze-board.pl':
@@ -30,28 +33,27 @@ class InternetGameGameknot(InternetGameInterface):
             ttype = TYPE_PUZZLE
             tkey = 'pz'
         else:
-            return False
+            return None
 
         # Read the arguments
         args = parse_qs(parsed.query)
         if tkey in args:
             gid = args[tkey][0]
             if gid.isdigit() and gid != '0':
-                self.id = gid
-                self.url_type = ttype
-                return True
-        return False
+                return self.new_job(url, gid, ttype)
+        return None
 
-    def download_game(self) -> Optional[str]:
+    def download_game(self, job: Optional[InternetGameJob] = None) -> Optional[str]:
         # Check
-        if self.url_type not in [TYPE_GAME, TYPE_PUZZLE] or self.id is None:
+        job = job or self.last_job
+        if (job is None) or (job.url_type not in [TYPE_GAME, TYPE_PUZZLE]):
             return None
 
         # Download
-        if self.url_type == TYPE_GAME:
-            url = 'https://gameknot.com/analyze-board.pl?bd=%s' % self.id
-        elif self.url_type == TYPE_PUZZLE:
-            url = 'https://gameknot.com/chess-puzzle.pl?pz=%s' % self.id
+        if job.url_type == TYPE_GAME:
+            url = 'https://gameknot.com/analyze-board.pl?bd=%s' % job.id
+        elif job.url_type == TYPE_PUZZLE:
+            url = 'https://gameknot.com/chess-puzzle.pl?pz=%s' % job.id
         page = self.download(url)
         if page is None:
             return None
@@ -83,7 +85,7 @@ class InternetGameGameknot(InternetGameInterface):
             return game
 
         # Logic for the puzzles
-        if self.url_type == TYPE_PUZZLE:
+        if job.url_type == TYPE_PUZZLE:
             structure = [('puzzle_id', 'i', '_id'),
                          ('puzzle_fen', 's', 'FEN'),
                          ('load_solution(', 's', '_solution')]
@@ -120,7 +122,7 @@ class InternetGameGameknot(InternetGameInterface):
                 game['_moves'] += '}'
 
         # Logic for the games
-        elif self.url_type == TYPE_GAME:
+        elif job.url_type == TYPE_GAME:
             # Header
             structure = [('anbd_movelist', 's', '_moves'),
                          ('anbd_result', 'i', 'Result'),
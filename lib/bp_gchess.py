@@ -7,7 +7,7 @@ import re
 from urllib.parse import urlparse, parse_qs
 
 from lib.const import BOARD_CHESS, METHOD_API
-from lib.bp_interface import InternetGameInterface
+from lib.bp_interface import InternetGameInterface, InternetGameJob
 
 
 # GChess.com
@@ -15,25 +15,28 @@ class InternetGameGchess(InternetGameInterface):
     def get_identity(self) -> Tuple[str, int, int]:
         return 'GChess.com', BOARD_CHESS, METHOD_API
 
-    def assign_game(self, url: str) -> bool:
+    def get_hosts(self) -> List[str]:
+        return ['gchess.com']
+
+    def assign_game(self, url: str) -> Optional[InternetGameJob]:
         # Verify the host
         parsed = urlparse(url.replace('/#/', '/'))
         if parsed.netloc.lower() not in ['www.gchess.com', 'gchess.com']:
-            return False
+            return None
 
         # Read the identifier
         args = parse_qs(parsed.query)
         if 'game' in args:
             gid = args['game'][0].replace('top-games-', '')
             if gid.isdigit() and gid != '0':
-                self.id = gid
-                return True
-        return False
+                return self.new_job(url, gid)
+        return None
 
-    def download_game(self) -> Optional[str]:
-        if self.id is None:
+    def download_game(self, job: Optional[InternetGameJob] = None) -> Optional[str]:
+        job = job or self.last_job
+        if job is None:
             return None
-        url = 'https://gchess.com/api/game.php?id=%s' % self.id
+        url = 'https://gchess.com/api/game.php?id=%s' % job.id
         bourne = self.send_xhr(url, None)
         data = self.json_loads(bourne)
         if data is None:
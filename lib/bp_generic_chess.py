@@ -4,12 +4,11 @@
 # GPL version 3
 
 from typing import Optional, List, Tuple
-from urllib.request import Request, urlopen
 from urllib.parse import urlparse
 from html.parser import HTMLParser
 
 from lib.const import BOARD_CHESS, METHOD_MISC
-from lib.bp_interface import InternetGameInterface
+from lib.bp_interface import InternetGameInterface, InternetGameJob
 
 
 # Generic
@@ -17,25 +16,26 @@ class InternetGameGenericChess(InternetGameInterface):
     def get_identity(self) -> Tuple[str, int, int]:
         return 'Generic for chess', BOARD_CHESS, METHOD_MISC
 
-    def assign_game(self, url: str) -> bool:
+    def get_hosts(self) -> List[str]:
+        return ['*']
+
+    def assign_game(self, url: str) -> Optional[InternetGameJob]:
         # Any page is valid
-        self.id = url
-        return True
+        return self.new_job(url, url)
 
-    def download_game(self) -> Optional[str]:
+    def download_game(self, job: Optional[InternetGameJob] = None) -> Optional[str]:
         # Check
-        if self.id is None:
+        job = job or self.last_job
+        if job is None:
             return None
 
         # Download
-        req = Request(self.id, headers={'User-Agent': self.user_agent})
-        with urlopen(req) as response:
-            mime = response.info().get_content_type().lower()
-            data = self.read_data(response)
-        if data is None:
+        data, mime = self.fetch(job.id, headers={'User-Agent': self.user_agent})
+        if (data is None) or (mime is None):
             return None
 
         # Chess file
+        mime = mime.lower()
         if (mime in ['application/x-chess-pgn', 'application/pgn', 'application/vnd.chess-pgn']) or (self.allow_octet_stream and (mime == 'application/octet-stream')):
             return data
 
@@ -59,7 +59,7 @@ class InternetGameGenericChess(InternetGameInterface):
             # Read the links
             parser = linksParser()
             parser.feed(data)
-            parser.links = self.expand_links(parser.links, self.id)
+            parser.links = self.expand_links(parser.links, job.id)
             return self.download_list(parser.links)
         return None
 
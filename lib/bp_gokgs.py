@@ -6,7 +6,7 @@ from typing import Optional, List, Tuple
 import re
 
 from lib.const import BOARD_GO, METHOD_DL
-from lib.bp_interface import InternetGameInterface
+from lib.bp_interface import InternetGameInterface, InternetGameJob
 
 
 # GoKGS.com
@@ -18,15 +18,20 @@ class InternetGameGokgs(InternetGameInterface):
     def get_identity(self) -> Tuple[str, int, int]:
         return 'GoKGS.com', BOARD_GO, METHOD_DL
 
-    def assign_game(self, url: str) -> bool:
+    def get_hosts(self) -> List[str]:
+        return ['gokgs.com']
+
+    def assign_game(self, url: str) -> Optional[InternetGameJob]:
         m = self.regexes['url'].match(url)
         if m is not None:
-            self.id = m.group(1)
-            return True
-        return False
-
-    def download_game(self) -> Optional[str]:
-        return self.download(self.id)
+            return self.new_job(url, m.group(1))
+        return None
+
+    def download_game(self, job: Optional[InternetGameJob] = None) -> Optional[str]:
+        job = job or self.last_job
+        if job is None:
+            return None
+        return self.download(job.id)
 
     def get_test_links(self) -> List[Tuple[str, bool]]:
         return [('http://files.gokgs.com/games/2020/3/23/patrickb-yasusaka.sgf', True),     # Game
@@ -7,7 +7,7 @@ from html import unescape
 from urllib.parse import urlparse, parse_qs
 
 from lib.const import BOARD_CHESS, METHOD_HTML
-from lib.bp_interface import InternetGameInterface
+from lib.bp_interface import InternetGameInterface, InternetGameJob
 
 
 # GreenChess.net
@@ -15,26 +15,29 @@ class InternetGameGreenchess(InternetGameInterface):
     def get_identity(self) -> Tuple[str, int, int]:
         return 'GreenChess.net', BOARD_CHESS, METHOD_HTML
 
-    def assign_game(self, url: str) -> bool:
+    def get_hosts(self) -> List[str]:
+        return ['greenchess.net']
+
+    def assign_game(self, url: str) -> Optional[InternetGameJob]:
         # Verify the host
         parsed = urlparse(url)
         if parsed.netloc.lower() not in ['www.greenchess.net', 'greenchess.net']:
-            return False
+            return None
 
         # Read the identifier
         args = parse_qs(parsed.query)
         if 'id' in args:
             gid = args['id'][0]
             if gid.isdigit() and gid != '0':
-                self.id = gid
-                return True
-        return False
+                return self.new_job(url, gid)
+        return None
 
-    def download_game(self) -> Optional[str]:
+    def download_game(self, job: Optional[InternetGameJob] = None) -> Optional[str]:
         # Download the page
-        if self.id is None:
+        job = job or self.last_job
+        if job is None:
             return None
-        url = 'https://greenchess.net/game.php?id=%s' % self.id
+        url = 'https://greenchess.net/game.php?id=%s' % job.id
         page = self.download(url)
         if page is None:
             return None
@@ -7,7 +7,7 @@ from typing import Optional, List, Tuple
 from urllib.parse import urlparse, parse_qs
 
 from lib.const import BOARD_CHESS, METHOD_DL, TYPE_EVENT, TYPE_GAME
-from lib.bp_interface import InternetGameInterface
+from lib.bp_interface import InternetGameInterface, InternetGameJob
 
 
 # Iccf.com
@@ -15,11 +15,14 @@ class InternetGameIccf(InternetGameInterface):
     def get_identity(self) -> Tuple[str, int, int]:
         return 'Iccf.com', BOARD_CHESS, METHOD_DL
 
-    def assign_game(self, url: str) -> bool:
+    def get_hosts(self) -> List[str]:
+        return ['iccf.com']
+
+    def assign_game(self, url: str) -> Optional[InternetGameJob]:
         # Verify the hostname
         parsed = urlparse(url)
         if parsed.netloc.lower() not in ['www.iccf.com', 'iccf.com']:
-            return False
+            return None
 
         # Verify the path
         ppl = parsed.path.lower()
@@ -28,29 +31,28 @@ class InternetGameIccf(InternetGameInterface):
         elif '/event' in ppl:
             ttyp = TYPE_EVENT
         else:
-            return False
+            return None
 
         # Read the arguments
         args = parse_qs(parsed.query)
         if 'id' in args:
             gid = args['id'][0]
             if gid.isdigit() and gid != '0':
-                self.url_type = ttyp
-                self.id = gid
-                return True
-        return False
+                return self.new_job(url, gid, ttyp)
+        return None
 
-    def download_game(self) -> Optional[str]:
+    def download_game(self, job: Optional[InternetGameJob] = None) -> Optional[str]:
         # Check
-        if self.url_type not in [TYPE_GAME, TYPE_EVENT] or self.id is None:
+        job = job or self.last_job
+        if (job is None) or (job.url_type not in [TYPE_GAME, TYPE_EVENT]):
             return None
 
         # Download
-        if self.url_type == TYPE_GAME:
+        if job.url_type == TYPE_GAME:
             url = 'https://www.iccf.com/GetPGN.aspx?id=%s'
-        elif self.url_type == TYPE_EVENT:
+        elif job.url_type == TYPE_EVENT:
             url = 'https://www.iccf.com/GetEventPGN.aspx?id=%s'
-        pgn = self.download(url % self.id)
+        pgn = self.download(url % job.id)
         if pgn in [None, ''] or 'does not exist.' in pgn or 'Invalid event' in pgn:
             return None
         return pgn
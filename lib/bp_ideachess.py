@@ -9,7 +9,7 @@ from base64 import b64decode
 from json import dumps
 
 from lib.const import BOARD_CHESS, METHOD_API
-from lib.bp_interface import InternetGameInterface
+from lib.bp_interface import InternetGameInterface, InternetGameJob
 
 
 # IdeaChess.com
@@ -21,7 +21,10 @@ class InternetGameIdeachess(InternetGameInterface):
     def get_identity(self) -> Tuple[str, int, int]:
         return 'IdeaChess.com', BOARD_CHESS, METHOD_API
 
-    def assign_game(self, url: str) -> bool:
+    def get_hosts(self) -> List[str]:
+        return ['ideachess.com']
+
+    def assign_game(self, url: str) -> Optional[InternetGameJob]:
         # Game ID
         m = self.regexes['url'].match(url)
         if m is not None:
@@ -36,21 +39,20 @@ class InternetGameIdeachess(InternetGameInterface):
                                   ('/scacchi_tattica/tattica_n/', 't')]
                 for path, ttyp in classification:
                     if path in url.lower():
-                        self.url_type = ttyp
-                        self.id = gid
-                        return True
-        return False
+                        return self.new_job(url, gid, ttyp)
+        return None
 
-    def download_game(self) -> Optional[str]:
+    def download_game(self, job: Optional[InternetGameJob] = None) -> Optional[str]:
         # Check
-        if self.url_type is None or self.id is None:
+        job = job or self.last_job
+        if job is None:
             return None
 
         # Fetch the puzzle
         api = 'http://www.ideachess.com/com/ajax2'
         data = {'message': dumps({'action': 100,
-                                  'data': {'problemNumber': int(self.id),
-                                           'kind': self.url_type}},
+                                  'data': {'problemNumber': int(job.id),
+                                           'kind': job.url_type}},
                                  separators=(',', ':'))}
         bourne = self.send_xhr(api, data)
         chessgame = self.json_loads(bourne)
@@ -59,10 +61,10 @@ class InternetGameIdeachess(InternetGameInterface):
 
         # Build the PGN
         game = {}
-        if self.url_type == 'm':
-            game['_url'] = 'http://www.ideachess.com/chess_tactics_puzzles/checkmate_n/%s' % self.id
-        elif self.url_type == 't':
-            game['_url'] = 'http://www.ideachess.com/chess_tactics_puzzles/tactics_n/%s' % self.id
+        if job.url_type == 'm':
+            game['_url'] = 'http://www.ideachess.com/chess_tactics_puzzles/checkmate_n/%s' % job.id
+        elif job.url_type == 't':
+            game['_url'] = 'http://www.ideachess.com/chess_tactics_puzzles/tactics_n/%s' % job.id
         else:
             assert False
         game['FEN'] = b64decode(self.json_field(chessgame, 'data/FEN')).decode().strip()
@@ -8,7 +8,7 @@ from math import floor
 import chess
 
 from lib.const import BOARD_CHESS, METHOD_HTML
-from lib.bp_interface import InternetGameInterface
+from lib.bp_interface import InternetGameInterface, InternetGameJob
 
 
 # Immortal.game
@@ -26,18 +26,21 @@ class InternetGameImmortal(InternetGameInterface):
     def get_identity(self) -> Tuple[str, int, int]:
         return 'Immortal.game', BOARD_CHESS, METHOD_HTML
 
-    def assign_game(self, url: str) -> bool:
+    def get_hosts(self) -> List[str]:
+        return ['immortal.game']
+
+    def assign_game(self, url: str) -> Optional[InternetGameJob]:
         m = self.regexes['url'].match(url)
         if m is not None:
-            self.id = str(m.group(1))
-            return True
-        return False
+            return self.new_job(url, str(m.group(1)))
+        return None
 
-    def download_game(self) -> Optional[str]:
+    def download_game(self, job: Optional[InternetGameJob] = None) -> Optional[str]:
         # Download the page
-        if self.id is None:
+        job = job or self.last_job
+        if job is None:
             return None
-        url = 'https://immortal.game/games/%s' % self.id
+        url = 'https://immortal.game/games/%s' % job.id
         page = self.download(url)
         if page is None:
             return None
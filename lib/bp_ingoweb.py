@@ -6,7 +6,7 @@ from typing import Optional, List, Tuple
 from urllib.parse import urlparse, parse_qs
 
 from lib.const import BOARD_GO, METHOD_DL
-from lib.bp_interface import InternetGameInterface
+from lib.bp_interface import InternetGameInterface, InternetGameJob
 
 
 # Ingo-web.com
@@ -14,7 +14,10 @@ class InternetGameIngoweb(InternetGameInterface):
     def get_identity(self) -> Tuple[str, int, int]:
         return 'Ingo-web.com', BOARD_GO, METHOD_DL
 
-    def assign_game(self, url: str) -> bool:
+    def get_hosts(self) -> List[str]:
+        return ['ingo-web.com']
+
+    def assign_game(self, url: str) -> Optional[InternetGameJob]:
         # Verify the URL
         parsed = urlparse(url)
         if parsed.netloc.lower() in ['www.ingo-web.com', 'ingo-web.com']:
@@ -23,13 +26,13 @@ class InternetGameIngoweb(InternetGameInterface):
             if 'gid' in args:
                 gid = args['gid'][0]
                 if gid.isdigit() and len(gid) == 14:
-                    self.id = gid
-                    return True
-        return False
+                    return self.new_job(url, gid)
+        return None
 
-    def download_game(self) -> Optional[str]:
-        if self.id is not None:
-            data = self.download('https://ingo-web.com/jsgo.cgi?m=download&gid=%s' % self.id)
+    def download_game(self, job: Optional[InternetGameJob] = None) -> Optional[str]:
+        job = job or self.last_job
+        if job is not None:
+            data = self.download('https://ingo-web.com/jsgo.cgi?m=download&gid=%s' % job.id)
             if data != '':
                 return data
         return None
@@ -3,16 +3,39 @@
 # https://github.com/ecrucru/boards
 # GPL version 3
 
-from typing import Optional, Any, Dict, List, Tuple, Union
+from typing import Optional, Any, Callable, Dict, Iterable, Iterator, List, Mapping, NamedTuple, Tuple, Union
 from abc import abstractmethod
+from types import MappingProxyType
+import asyncio
+import codecs
+import contextvars
+import inspect
 import logging
 import re
 import json
-from urllib.request import Request, urlopen
+from concurrent.futures import ThreadPoolExecutor, wait
+from contextlib import ExitStack
+from time import perf_counter, sleep
+from urllib.error import HTTPError
+from urllib.request import Request
 from urllib.parse import urlparse, urlencode
-from http.client import HTTPResponse
+from http.client import HTTPResponse, IncompleteRead
 
-from lib.const import METHOD_WS, BOARD_CHESS, BOARD_DRAUGHTS, BOARD_GO, CHESS960, FEN_START, FEN_START_960
+from lib.cache import http_cache
+from lib.const import BOARD_CHESS, BOARD_DRAUGHTS, BOARD_GO, CHESS960, FEN_START, FEN_START_960
+from lib.deadline import current_deadline
+from lib.singleflight import flights
+from lib.throttle import throttle
+from lib.transport import InternetDecompressor, http_pool, http_session, retry_delay
+
+
+# Immutable description of a game detected by assign_game() and processed by download_game()
+class InternetGameJob(NamedTuple):
+    provider: 'InternetGameInterface'
+    url: str
+    id: str
+    url_type: Any = None
+    extra: Mapping[str, Any] = MappingProxyType({})
 
 
 # Abstract class to download a game from the Internet
@@ -25,14 +48,19 @@ class InternetGameInterface:
         self.user_agent = 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36'  # Cloudflare Browser Integrity Check
         self.allow_octet_stream = False
         self.use_sanitization = True
+        self.max_attempts = 3                   # Budget of attempts per request for the transient errors
+        self.timeout = 20.0                     # Maximal duration of a request in seconds, within the deadline of the download
+        self.max_links = 50                     # Anti-flood for download_list()
+        self.max_threads = 8                    # Threads of every call of map_concurrently(), beyond the workers of the application
+        self.hedge_delay = 1.5                  # Seconds before hedge() starts the next alternative
+        self.bulk_size = 100                    # Maximal number of jobs per call of download_bulk()
         self.regexes = {'fen': re.compile(r'^[kqbnrp1-8\/]+\s[w|b]\s[kq-]+\s[a-h-][1-8]?(\s[0-9]+)?(\s[0-9]+)?$', re.IGNORECASE),
-                        'strip_html': re.compile(r'<\/?[^>]+>', re.IGNORECASE)}
+                        'strip_html': re.compile(r'<\/?[^>]+>', re.IGNORECASE),
+                        'pgn_split': re.compile(r'\n[ \t]*\n\s*(?=\[)')}
 
     def reset(self) -> None:
-        ''' Clear the internal variables used to fetch the games. '''
-        self.id: Optional[str] = None
-        self.url_type: Optional[int] = None
-        self.data: Optional[str] = None
+        ''' Forget the last game detected by assign_game(). '''
+        self.last_job: Optional[InternetGameJob] = None
 
     def is_enabled(self) -> bool:
         ''' Override this method in the sub-class to disable a chess provider temporarily. '''
@@ -43,27 +71,34 @@ class InternetGameInterface:
         return self.get_identity()[0]
 
     def is_async(self) -> bool:
-        return self.get_identity()[2] == METHOD_WS
+        ''' Return True if download_game() is a coroutine. '''
+        return inspect.iscoroutinefunction(self.download_game)
 
     def get_game_id(self) -> Optional[str]:
         ''' Return the unique identifier of the game that was detected after a successful call to assign_game().
             The value is None if no game was found earlier. '''
-        return self.id
+        return None if self.last_job is None else self.last_job.id
+
+    def new_job(self, url: str, gid: str, url_type: Any = None, **extra: Any) -> InternetGameJob:
+        ''' Describe the game detected by assign_game(). The EXTRA arguments are specific to the board provider.
+            The job is also remembered for the legacy calls of download_game() without argument. '''
+        job = InternetGameJob(self, url, gid, url_type, MappingProxyType(extra))
+        self.last_job = job
+        return job
 
-    def reacts_to(self, url: Optional[str], host: str) -> bool:
-        ''' Return True if the URL belongs to the HOST (possibly equal to *). The sub-domains other than "www" are not supported.
+    def reacts_to(self, url: Optional[str], host: str) -> Optional[InternetGameJob]:
+        ''' Return a job if the URL belongs to the HOST (possibly equal to *). The sub-domains other than "www" are not supported.
             The method is used to accept any URL when a unique identifier cannot be extracted by assign_game(). '''
         # Verify the hostname
         if url is None:
-            return False
+            return None
         if host != '*':
             parsed = urlparse(url)
             if parsed.netloc.lower() not in ['www.' + host.lower(), host.lower()]:
-                return False
+                return None
 
         # Any page is valid
-        self.id = url
-        return True
+        return self.new_job(url, url)
 
     def json_loads(self, data: Optional[str]) -> Optional[Dict]:
         ''' Load a JSON and handle the errors.
@@ -102,15 +137,40 @@ class InternetGameInterface:
         return default if value in [None, ''] else value
 
     def read_data(self, response: Optional[HTTPResponse]) -> Optional[str]:
-        ''' Read the data from an HTTP request and execute the charset conversion.
+        ''' Read the data from an HTTP request, decompress it and execute the charset conversion.
             The value None is returned in case of error. '''
         # Check
         if response is None:
             return None
-        bdata = response.read()
+        bdata = self.read_bytes(response)
+        if bdata is None:
+            return None
+        return self.decode_data(bdata, response.info().get_content_charset())
 
+    def read_bytes(self, response: HTTPResponse) -> Optional[bytes]:
+        ''' Read the raw data from an HTTP request and decompress it on the fly.
+            The value None is returned in case of error. '''
+        encoding = (response.info().get('Content-Encoding') or '').strip().lower()
+        if encoding in ['', 'identity']:
+            return response.read()
+        try:
+            decompressor = InternetDecompressor(encoding)
+            chunks = []
+            while True:
+                chunk = response.read(65536)
+                if not chunk:
+                    break
+                chunks.append(decompressor.decompress(chunk))
+            chunks.append(decompressor.flush())
+            return b''.join(chunks)
+        except Exception as exception:
+            logging.error('Error in the decompression of the data: %s', str(exception))
+            return None
+
+    def decode_data(self, bdata: bytes, cs: Optional[str]) -> Optional[str]:
+        ''' Convert the raw data into text with the charset CS, else UTF-8 or Latin-1.
+            The value None is returned in case of error. '''
         # Decode
-        cs = response.info().get_content_charset()
         try:
             if cs is not None:
                 data = bdata.decode(cs)
@@ -142,6 +202,117 @@ class InternetGameInterface:
             links[i] = link
         return list(dict.fromkeys(links))       # Without duplicate entries
 
+    def fetch(self, url: str, data: Optional[bytes] = None, headers: Optional[Dict[str, str]] = None) -> Tuple[Optional[str], Optional[str]]:
+        ''' Execute an HTTP request through the disk cache and return the text of the response with its MIME type.
+            The concurrent identical requests share the same execution. The HTTP errors raise an exception. '''
+        key = http_cache.key('GET' if data is None else 'POST', url, data, headers)
+        return flights.run(key, lambda: self.perform(url, data, headers))
+
+    def perform(self, url: str, data: Optional[bytes] = None, headers: Optional[Dict[str, str]] = None) -> Tuple[Optional[str], Optional[str]]:
+        ''' Execute the HTTP request of fetch(). '''
+        # Fresh response in the cache
+        key = http_cache.key('GET' if data is None else 'POST', url, data, headers)
+        entry = http_cache.lookup(key)
+        if (entry is not None) and entry.is_fresh():
+            logging.debug('Cached response: %s', url)
+            return self.decode_data(entry.body, entry.charset), entry.mime
+
+        # Conditional request
+        hdrs = dict(headers or {})
+        if entry is not None:
+            hdrs.update(entry.validators())
+        host = urlparse(url).hostname
+        deadline = current_deadline.get()
+        attempt = 0
+        while True:
+            attempt += 1
+            start = perf_counter()
+            try:
+                with throttle.slot(host, deadline.timeout()):
+                    with http_pool.urlopen(Request(url, data, headers=hdrs), timeout=deadline.timeout(self.timeout)) as response:
+                        status = response.status
+                        info = response.info()
+                        bdata = self.read_bytes(response)
+                logging.debug('Attempt %d for %s: HTTP %d in %.0f ms', attempt, url, status, 1000 * (perf_counter() - start))
+                break
+            except Exception as exception:
+                if isinstance(exception, HTTPError) and (exception.code == 304) and (entry is not None):   # urllib raises the status 304 when a proxy is used
+                    status, info, bdata = 304, exception.headers, b''
+                    break
+                delay = retry_delay(exception, attempt, self.max_attempts)
+                logging.debug('Attempt %d for %s: %s in %.0f ms', attempt, url, str(exception), 1000 * (perf_counter() - start))
+                if (delay is None) or not deadline.allows(delay):
+                    raise
+                logging.debug('Retrying in %.1f s', delay)
+                sleep(delay)
+
+        # Revalidated response
+        if (status == 304) and (entry is not None):
+            logging.debug('Revalidated response: %s', url)
+            http_cache.refresh(key, entry, info)
+            return self.decode_data(entry.body, entry.charset), entry.mime
+
+        # New response
+        if bdata is None:
+            return None, None
+        charset, mime = info.get_content_charset(), info.get_content_type()
+        http_cache.store(key, info, bdata, charset, mime)
+        return self.decode_data(bdata, charset), mime
+
+    async def fetch_async(self, url: str, data: Optional[bytes] = None, headers: Optional[Dict[str, str]] = None) -> Tuple[Optional[str], Optional[str]]:
+        ''' Execute an HTTP request through the disk cache without blocking the event loop.
+            The text of the response is returned with its MIME type, and the HTTP errors raise an exception.
+            The concurrent identical requests share the same execution. '''
+        key = http_cache.key('GET' if data is None else 'POST', url, data, headers)
+        return await flights.run_async(key, lambda: self.perform_async(url, data, headers))
+
+    async def perform_async(self, url: str, data: Optional[bytes] = None, headers: Optional[Dict[str, str]] = None) -> Tuple[Optional[str], Optional[str]]:
+        ''' Execute the HTTP request of fetch_async(). '''
+        # Fresh response in the cache
+        key = http_cache.key('GET' if data is None else 'POST', url, data, headers)
+        entry = http_cache.lookup(key)
+        if (entry is not None) and entry.is_fresh():
+            logging.debug('Cached response: %s', url)
+            return self.decode_data(entry.body, entry.charset), entry.mime
+
+        # Conditional request
+        hdrs = dict(headers or {})
+        if entry is not None:
+            hdrs.update(entry.validators())
+        from aiohttp import ClientTimeout
+        session = await http_session.get()
+        host = urlparse(url).hostname
+        deadline = current_deadline.get()
+        attempt = 0
+        while True:
+            attempt += 1
+            start = perf_counter()
+            try:
+                async with throttle.slot_async(host, deadline.timeout()):
+                    timeout = ClientTimeout(total=deadline.timeout(self.timeout))
+                    async with session.request('GET' if data is None else 'POST', url, data=data, headers=hdrs, timeout=timeout) as response:
+                        status, info, charset, mime = response.status, response.headers, response.charset, response.content_type
+                        bdata = await response.read()
+                logging.debug('Attempt %d for %s: HTTP %d in %.0f ms', attempt, url, status, 1000 * (perf_counter() - start))
+                break
+            except Exception as exception:
+                delay = retry_delay(exception, attempt, self.max_attempts)
+                logging.debug('Attempt %d for %s: %s in %.0f ms', attempt, url, str(exception), 1000 * (perf_counter() - start))
+                if (delay is None) or not deadline.allows(delay):
+                    raise
+                logging.debug('Retrying in %.1f s', delay)
+                await asyncio.sleep(delay)
+
+        # Revalidated response
+        if (status == 304) and (entry is not None):
+            logging.debug('Revalidated response: %s', url)
+            http_cache.refresh(key, entry, info)
+            return self.decode_data(entry.body, entry.charset), entry.mime
+
+        # New response
+        http_cache.store(key, info, bdata, charset, mime)
+        return self.decode_data(bdata, charset), mime
+
     def download(self, url: Optional[str]) -> Optional[str]:
         ''' Download the URL from the Internet.
             The value None is returned in case of error. '''
@@ -152,30 +323,149 @@ class InternetGameInterface:
         # Download
         try:
             logging.debug('Downloading game: %s', url)
-            headers = {'User-Agent': self.user_agent}
-            with urlopen(Request(str(url), headers=headers)) as response:
-                data = self.read_data(response)
+            data, _ = self.fetch(str(url), headers={'User-Agent': self.user_agent})
             return None if data is None or (len(data) == 0) else data
         except Exception as exception:
             logging.debug('Exception raised: %s', str(exception))
             return None
 
-    def download_list(self, links: List[str]) -> Optional[str]:
-        ''' Download and concatenate the URL given in the array LINKS.
-            The number of downloads is limited to 10.
+    async def download_async(self, url: Optional[str]) -> Optional[str]:
+        ''' Download the URL from the Internet without blocking the event loop.
+            The value None is returned in case of error. '''
+        # Check
+        if url in [None, '']:
+            return None
+
+        # Download
+        try:
+            logging.debug('Downloading game: %s', url)
+            data, _ = await self.fetch_async(str(url), headers={'User-Agent': self.user_agent})
+            return None if data is None or (len(data) == 0) else data
+        except Exception as exception:
+            logging.debug('Exception raised: %s', str(exception))
+            return None
+
+    def download_list(self, links: List[str], limit: Optional[int] = None) -> Optional[str]:
+        ''' Download and concatenate the URL given in the array LINKS, in their order.
+            The links are downloaded concurrently within the limits of their hosts.
+            The number of downloads is limited to LIMIT, else to the attribute max_links.
             The downloads that failed are dropped silently.
             The value None is returned in case of no data or error. '''
-        pgn = ''
-        for i, link in enumerate(links):
-            data = self.download(link)
-            if data not in [None, '']:
-                pgn += '%s\n\n' % data
-            if i >= 10:                             # Anti-flood
-                break
+        links = links[:self.max_links if limit is None else limit]
+        pgn = ''.join('%s\n\n' % data for data in self.map_concurrently(self.download, links) if isinstance(data, str) and (data != ''))
         if pgn == '':
             return None
         return pgn
 
+    def stream(self, url: str, headers: Optional[Dict[str, str]] = None) -> Iterator[str]:
+        ''' Download the URL by chunks and yield its games as soon as they are complete, so that the memory stays bounded.
+            The cache is bypassed, only the connection is retried and the HTTP errors raise an exception. '''
+        logging.debug('Streaming: %s', url)
+        hdrs = {'User-Agent': self.user_agent}
+        if headers is not None:
+            hdrs.update(headers)
+        host = urlparse(url).hostname
+        deadline = current_deadline.get()
+        attempt = 0
+        while True:
+            attempt += 1
+            stack = ExitStack()
+            try:
+                stack.enter_context(throttle.slot(host, deadline.timeout()))
+                response = stack.enter_context(http_pool.urlopen(Request(url, headers=hdrs), timeout=deadline.timeout(self.timeout)))    # For the connection and every read
+                break
+            except Exception as exception:
+                stack.close()
+                delay = retry_delay(exception, attempt, self.max_attempts)
+                logging.debug('Attempt %d for %s: %s', attempt, url, str(exception))
+                if (delay is None) or not deadline.allows(delay):
+                    raise
+                logging.debug('Retrying in %.1f s', delay)
+                sleep(delay)
+        with stack:
+            encoding = (response.info().get('Content-Encoding') or '').strip().lower()
+            decompressor = None if encoding in ['', 'identity'] else InternetDecompressor(encoding)
+            decoder = codecs.getincrementaldecoder(response.info().get_content_charset() or 'utf-8')(errors='replace')
+            buffer = ''
+            while True:
+                chunk = response.read1(65536)                          # Without waiting for a full buffer
+                if decompressor is not None:
+                    chunk = decompressor.decompress(chunk) if chunk else decompressor.flush()
+                buffer += decoder.decode(chunk, final=not chunk).replace('\ufeff', '').replace('\r', '')
+
+                # A game is complete when the next one starts
+                games = self.regexes['pgn_split'].split(buffer)
+                buffer = games.pop()
+                for game in games:
+                    if game.strip() != '':
+                        yield game.strip()
+                if not chunk:
+                    break
+            raw = getattr(response, 'response', response)                # Pooled or proxied response
+            if raw.length:
+                raise IncompleteRead(b'', raw.length)                   # Connection closed before the end of the body
+            if buffer.strip() != '':
+                yield buffer.strip()
+
+    def map_concurrently(self, func: Callable[[Any], Any], items: Iterable[Any]) -> List[Any]:
+        ''' Call FUNC for every item in a pool of max_threads threads and return the results in the order of the ITEMS.
+            The exception raised for an item becomes its result. The deadline of the download is kept. '''
+        items = list(items)
+        if len(items) == 0:
+            return []
+        results: List[Any] = []
+        with ThreadPoolExecutor(max_workers=min(len(items), self.max_threads)) as pool:
+            futures = [pool.submit(contextvars.copy_context().run, func, item) for item in items]
+            for future in futures:
+                try:
+                    results.append(future.result())
+                except Exception as exception:
+                    results.append(exception)
+        return results
+
+    def hedge(self, funcs: List[Callable[[], Any]], accept: Callable[[Any], bool] = lambda x: x is not None, delay: Optional[float] = None) -> Any:
+        ''' Call the alternative FUNCS given from the most preferred to the least, and return the first result accepted by ACCEPT, else None.
+            A function starts when the previous one failed or after DELAY seconds (attribute hedge_delay by default), so that the
+            fallbacks are already in progress when the preferred alternatives fail. A result is used only when all the preferred
+            alternatives failed, and the remaining calls are abandoned. The exceptions count as failures. '''
+        if len(funcs) == 0:
+            return None
+        if delay is None:
+            delay = self.hedge_delay
+        pool = ThreadPoolExecutor(max_workers=len(funcs))
+        futures: List[Any] = []
+        try:
+            futures.append(pool.submit(contextvars.copy_context().run, funcs[0]))
+            current = 0
+            while current < len(futures):
+                # Wait for the preferred alternative, or start the next one
+                future = futures[current]
+                hedging = len(futures) < len(funcs)
+                wait([future], delay if hedging else current_deadline.get().remaining())
+                if not future.done():
+                    if not hedging:
+                        logging.debug('Deadline exceeded')
+                        return None
+                    logging.debug('Hedging with the alternative %d', len(futures) + 1)
+                    futures.append(pool.submit(contextvars.copy_context().run, funcs[len(futures)]))
+                    continue
+
+                # Result
+                try:
+                    result = future.result()
+                    if accept(result):
+                        return result
+                except Exception as exception:
+                    logging.debug('Exception raised: %s', str(exception))
+                current += 1
+                if (current == len(futures)) and (current < len(funcs)):
+                    futures.append(pool.submit(contextvars.copy_context().run, funcs[current]))
+            return None
+        finally:
+            for future in futures:
+                future.cancel()
+            pool.shutdown(wait=False)
+
     def send_xhr(self, url: Optional[str], postData: Optional[Dict], headers: Optional[Dict[str, str]] = None) -> Optional[str]:
         ''' Call a target URL by submitting the POSTDATA.
             The value None is returned in case of error. '''
@@ -194,8 +484,31 @@ class InternetGameInterface:
                     'Accept': 'application/json, text/plain, */*'}
             if headers is not None:
                 hdrs.update(headers)
-            with urlopen(Request(str(url), data, headers=hdrs)) as response:
-                respdata = self.read_data(response)
+            respdata, _ = self.fetch(str(url), data, hdrs)
+            return respdata
+        except Exception as exception:
+            logging.debug('Exception raised: %s', str(exception))
+            return None
+
+    async def send_xhr_async(self, url: Optional[str], postData: Optional[Dict], headers: Optional[Dict[str, str]] = None) -> Optional[str]:
+        ''' Call a target URL by submitting the POSTDATA without blocking the event loop.
+            The value None is returned in case of error. '''
+        # Check
+        if url in [None, '']:
+            return None
+
+        # Call data
+        try:
+            logging.debug('Calling API: %s', url)
+            hdrs = {'User-Agent': self.user_agent,
+                    'Accept': 'application/json, text/plain, */*'}
+            if headers is not None:
+                hdrs.update(headers)
+            if postData is not None:
+                hdrs.setdefault('Content-Type', 'application/x-www-form-urlencoded')
+                respdata, _ = await self.fetch_async(str(url), urlencode(postData).encode(), hdrs)
+            else:
+                respdata, _ = await self.fetch_async(str(url), None, hdrs)
             return respdata
         except Exception as exception:
             logging.debug('Exception raised: %s', str(exception))
@@ -306,13 +619,43 @@ class InternetGameInterface:
     def get_identity(self) -> Tuple[str, int, int]:
         ''' (Abstract) Name and technique of the board provider. '''
 
+    def get_hosts(self) -> List[str]:
+        ''' Hostnames served by the board provider, without "www." as the sub-domains are accepted too.
+            The value "*" puts the board provider in the fallback tier of the router. '''
+        return ['*']
+
     @abstractmethod
-    def assign_game(self, url: str) -> bool:
-        ''' (Abstract) Detect the unique identifier of URL. '''
+    def assign_game(self, url: str) -> Optional[InternetGameJob]:
+        ''' (Abstract) Detect the unique identifier of URL and return the job to download it, else None.
+            The method must not alter the state of the board provider, except through new_job(). '''
 
     @abstractmethod
-    def download_game(self) -> Optional[str]:
-        ''' (Abstract) Download the game identified earlier by assign_game(). '''
+    def download_game(self, job: Optional[InternetGameJob] = None) -> Optional[str]:
+        ''' (Abstract) Download the game described by the JOB returned by assign_game().
+            Without JOB, the last job detected by assign_game() is used for the compatibility with the former calls. '''
+
+    def can_bulk(self, job: InternetGameJob) -> bool:
+        ''' Tell if the JOB can be downloaded together with other jobs by download_bulk(). '''
+        return False
+
+    def download_bulk(self, jobs: List[InternetGameJob]) -> List[Optional[str]]:
+        ''' Download several JOBS accepted by can_bulk() and return their games in the same order, None for the missing ones.
+            By default, the jobs are downloaded one by one. '''
+        return [self.download_game(job) for job in jobs]
+
+    def stream_game(self, job: InternetGameJob) -> Optional[Iterator[str]]:
+        ''' Return an iterator over the games of the JOB as they are downloaded, typically with stream().
+            The value None is returned if the board provider cannot stream the JOB, download_game() being used instead. '''
+        return None
+
+    async def shutdown(self) -> None:
+        ''' Release the resources kept between the downloads, before the end of the event loop. '''
+        pass
+
+    def follow_game(self, job: InternetGameJob, state: Dict[str, Any]) -> Optional[List[str]]:
+        ''' Poll the live event described by the JOB and return the games that are new or changed since the previous call with the same STATE.
+            The value None is returned if the board provider cannot follow the event, or if the event is over. '''
+        return None
 
     @abstractmethod
     def get_test_links(self) -> List[Tuple[str, bool]]:
@@ -3,14 +3,13 @@
 # https://github.com/ecrucru/boards
 # GPL version 3
 
-from typing import Optional, Dict, Tuple
+from typing import Optional, Dict, Iterator, List, Tuple
+import logging
 import re
-from urllib.request import Request, urlopen
 from urllib.error import HTTPError
-import chess
 
 from lib.const import BOARD_CHESS, METHOD_MISC, TYPE_GAME, TYPE_PUZZLE, TYPE_STUDY, TYPE_SWISS, TYPE_TOURNAMENT
-from lib.bp_interface import InternetGameInterface
+from lib.bp_interface import InternetGameInterface, InternetGameJob
 
 
 # Base for the clones of Lichess
@@ -31,12 +30,17 @@ class InternetGameLibase(InternetGameInterface):
                              'puzzle': re.compile(r'^https?:\/\/(\S+\.)?%s\/([a-z]{2}/)?training\/([a-z0-9]+\/)?([a-z0-9]+)[\/\?\#]?' % hreg, re.IGNORECASE),
                              'study': re.compile(r'^https?:\/\/(\S+\.)?%s\/study\/([a-z0-9]{8}(\/[a-z0-9]{8})?)(\.%s)?\/?([\S\/]+)?$' % (hreg, self._ext), re.IGNORECASE),
                              'swiss': re.compile(r'^https?:\/\/(\S+\.)?%s\/swiss\/([a-z0-9]{8})[\/\?\#]?' % hreg, re.IGNORECASE),
-                             'tournament': re.compile(r'^https?:\/\/(\S+\.)?%s\/tournament\/([a-z0-9]{8})[\/\?\#]?' % hreg, re.IGNORECASE)})
+                             'tournament': re.compile(r'^https?:\/\/(\S+\.)?%s\/tournament\/([a-z0-9]{8})[\/\?\#]?' % hreg, re.IGNORECASE),
+                             'bulk_site': re.compile(r'^\[Site "https?:\/\/[^"\/]*%s\/([a-z0-9]{8})"\]' % hreg, re.IGNORECASE | re.MULTILINE)})
+        self.bulk_size = 300                                            # Identifiers per bulk export
 
     def get_identity(self) -> Tuple[str, int, int]:
         return self._host.capitalize(), BOARD_CHESS, METHOD_MISC
 
-    def assign_game(self, url: str) -> bool:
+    def get_hosts(self) -> List[str]:
+        return [self._host.lower()]
+
+    def assign_game(self, url: str) -> Optional[InternetGameJob]:
         for name, typ, pid in [('broadcast', TYPE_STUDY, 3),
                                ('practice', TYPE_STUDY, 2),
                                ('puzzle', TYPE_PUZZLE, 4),
@@ -48,77 +52,120 @@ class InternetGameLibase(InternetGameInterface):
             if name in self.regexes:
                 m = self.regexes[name].match(url)
                 if m is not None:
-                    self.url_type = typ
-                    self.id = m.group(pid)
-                    return True
-        return False
+                    return self.new_job(url, m.group(pid), typ)
+        return None
 
     def query_api(self, path: str) -> Optional[Dict]:
         if not self._use_api:
             return None
         try:
-            with urlopen(Request('https://%s%s' % (self._host, path),
-                                 headers={'X-Requested-With': 'XMLHttpRequest',
-                                          'Accept': 'application/vnd.lichess.v4+json'})) as response:
-                bourne = self.read_data(response)
+            bourne, _ = self.fetch('https://%s%s' % (self._host, path),
+                                   headers={'X-Requested-With': 'XMLHttpRequest',
+                                            'Accept': 'application/vnd.lichess.v4+json'})
             return self.json_loads(bourne)
         except HTTPError:
             return None
 
-    def download_game(self) -> Optional[str]:
+    def can_bulk(self, job: InternetGameJob) -> bool:
+        return self._use_api and (self._ext == 'pgn') and (job.url_type == TYPE_GAME)
+
+    def download_bulk(self, jobs: List[InternetGameJob]) -> List[Optional[str]]:
+        # Export the games by chunks of identifiers, one request at a time as expected by Lichess
+        ids = list(dict.fromkeys(job.id for job in jobs))
+        chunks = [ids[i:i + self.bulk_size] for i in range(0, len(ids), self.bulk_size)]
+        exports = []
+        for chunk in chunks:
+            try:
+                exports.append(self.fetch('https://%s/api/games/export/_ids?literate=1' % self._host,
+                                          ','.join(chunk).encode(),
+                                          {'User-Agent': self.user_agent,
+                                           'Content-Type': 'text/plain',
+                                           'Accept': 'application/x-chess-pgn'})[0])
+            except Exception as exception:
+                logging.debug('Exception raised: %s', str(exception))
+
+        # Split the finished games by identifier, the others being rebuilt by download_game()
+        games: Dict[str, str] = {}
+        for export in exports:
+            if not isinstance(export, str):
+                continue
+            for game in self.regexes['pgn_split'].split(export):
+                m = self.regexes['bulk_site'].search(game)
+                if (m is not None) and ('[Result "*"]' not in game):
+                    games[m.group(1)] = game.strip()
+        logging.debug('Bulk export of %d games in %d requests: %d found', len(ids), len(chunks), len(games))
+        return [games.get(job.id) for job in jobs]
+
+    def stream_game(self, job: InternetGameJob) -> Optional[Iterator[str]]:
+        if self._host is None:
+            return None
+        if job.url_type == TYPE_STUDY:
+            return self.stream('https://%s/study/%s.%s' % (self._host, job.id, self._ext))
+        if job.url_type == TYPE_SWISS:
+            return self.stream('https://%s/api/swiss/%s/games' % (self._host, job.id))
+        if job.url_type == TYPE_TOURNAMENT:
+            return self.stream('https://%s/api/tournament/%s/games' % (self._host, job.id))
+        return None
+
+    def download_ongoing(self, job: InternetGameJob) -> Optional[str]:
+        ''' Rebuild the PGN of an ongoing game. The value None is returned for the finished games, and an empty string for the refused ones. '''
+        api = self.query_api('/import/master/%s/white' % job.id)
+        game = self.json_field(api, 'game')
+        if (api is None) or ('winner' in game):
+            return None
+        if not self.allow_extra and game['rated']:
+            return ''
+
+        # Rebuild the PGN file
+        game = {}
+        game['_url'] = 'https://%s%s' % (self._host, self.json_field(api, 'url/round'))
+        game['Variant'] = self.json_field(api, 'game/variant/name')
+        game['FEN'] = self.json_field(api, 'game/initialFen')
+        game['SetUp'] = '1'
+        game['White'] = self.json_field(api, 'player/name', self.json_field(api, 'player/user/username', 'Anonymous'))
+        game['WhiteElo'] = self.json_field(api, 'player/rating')
+        game['Black'] = self.json_field(api, 'opponent/name', self.json_field(api, 'opponent/user/username', 'Anonymous'))
+        game['BlackElo'] = self.json_field(api, 'opponent/rating')
+        if self.json_field(api, 'clock') != '':
+            game['TimeControl'] = '%d+%d' % (self.json_field(api, 'clock/initial'), self.json_field(api, 'clock/increment'))
+        else:
+            game['TimeControl'] = '%dd' % (self.json_field(api, 'correspondence/increment') // 86400)
+        game['Result'] = '*'
+        game['_moves'] = ''
+        moves = self.json_field(api, 'steps')
+        for move in moves:
+            if move['ply'] > 0:
+                game['_moves'] += ' %s' % move['san']
+        return self.rebuild_pgn(game)
+
+    def download_game(self, job: Optional[InternetGameJob] = None) -> Optional[str]:
         # Check
-        if None in [self.id, self._host]:
+        job = job or self.last_job
+        if (job is None) or (self._host is None):
             return None
 
         # Logic for the studies
-        if self.url_type == TYPE_STUDY:
-            return self.download('https://%s/study/%s.%s' % (self._host, self.id, self._ext))
+        if job.url_type == TYPE_STUDY:
+            return self.download('https://%s/study/%s.%s' % (self._host, job.id, self._ext))
 
         # Logic for the swiss tournaments
-        if self.url_type == TYPE_SWISS:
-            return self.download('https://%s/api/swiss/%s/games' % (self._host, self.id))
+        if job.url_type == TYPE_SWISS:
+            return self.download('https://%s/api/swiss/%s/games' % (self._host, job.id))
 
         # Logic for the tournaments
-        if self.url_type == TYPE_TOURNAMENT:
-            return self.download('https://%s/api/tournament/%s/games' % (self._host, self.id))
-
-        # Logic for the games
-        if self.url_type == TYPE_GAME:
-            # Download the finished game
-            api = self.query_api('/import/master/%s/white' % self.id)
-            game = self.json_field(api, 'game')
-            if (api is None) or ('winner' in game):
-                url = 'https://%s/game/export/%s?literate=1' % (self._host, self.id)
-                return self.download(url)
-            if not self.allow_extra and game['rated']:
-                return None
+        if job.url_type == TYPE_TOURNAMENT:
+            return self.download('https://%s/api/tournament/%s/games' % (self._host, job.id))
 
-            # Rebuild the PGN file
-            game = {}
-            game['_url'] = 'https://%s%s' % (self._host, self.json_field(api, 'url/round'))
-            game['Variant'] = self.json_field(api, 'game/variant/name')
-            game['FEN'] = self.json_field(api, 'game/initialFen')
-            game['SetUp'] = '1'
-            game['White'] = self.json_field(api, 'player/name', self.json_field(api, 'player/user/username', 'Anonymous'))
-            game['WhiteElo'] = self.json_field(api, 'player/rating')
-            game['Black'] = self.json_field(api, 'opponent/name', self.json_field(api, 'opponent/user/username', 'Anonymous'))
-            game['BlackElo'] = self.json_field(api, 'opponent/rating')
-            if self.json_field(api, 'clock') != '':
-                game['TimeControl'] = '%d+%d' % (self.json_field(api, 'clock/initial'), self.json_field(api, 'clock/increment'))
-            else:
-                game['TimeControl'] = '%dd' % (self.json_field(api, 'correspondence/increment') // 86400)
-            game['Result'] = '*'
-            game['_moves'] = ''
-            moves = self.json_field(api, 'steps')
-            for move in moves:
-                if move['ply'] > 0:
-                    game['_moves'] += ' %s' % move['san']
-            return self.rebuild_pgn(game)
+        # Logic for the games, exported meanwhile if the check of their status is slow
+        if job.url_type == TYPE_GAME:
+            pgn = self.hedge([lambda: self.download_ongoing(job),
+                              lambda: self.download('https://%s/game/export/%s?literate=1' % (self._host, job.id))])
+            return pgn or None
 
         # Logic for the puzzles
-        if self.url_type == TYPE_PUZZLE:
+        if job.url_type == TYPE_PUZZLE:
             # Fetch the puzzle
-            url = 'https://%s/training/%s' % (self._host, self.id)
+            url = 'https://%s/training/%s' % (self._host, job.id)
             page = self.download(url)
             if page is None:
                 return None
@@ -159,7 +206,7 @@ class InternetGameLibase(InternetGameInterface):
             game['Annotator'] = self.json_field(chessgame, 'game/author')
             game['X_TimeControl'] = self.json_field(chessgame, 'game/clock')
             game['X_Rating'] = rating
-            fen = self.json_field(chessgame, 'puzzle/initialSfen') or self.json_field(chessgame, 'game/sfen')  or self.json_field(chessgame, 'game/fen')
+            fen = self.json_field(chessgame, 'puzzle/initialSfen') or self.json_field(chessgame, 'game/sfen') or self.json_field(chessgame, 'game/fen')
             if fen != '':
                 game['Variant'] = self._variant
                 game['FEN'] = fen
@@ -190,6 +237,7 @@ class InternetGameLibase(InternetGameInterface):
                 # Current position
                 if self._variant != '':
                     return None
+                import chess                # Only the puzzles need it, so that the games load faster
                 board = chess.Board()
                 game['_moves'] = self.json_field(chessgame, 'game/pgn')
                 moves = game['_moves'].split(' ')
@@ -6,7 +6,7 @@ from typing import Optional, List, Tuple
 import re
 
 from lib.const import BOARD_DRAUGHTS, METHOD_DL, TYPE_GAME, TYPE_PUZZLE, TYPE_STUDY
-from lib.bp_interface import InternetGameInterface
+from lib.bp_interface import InternetGameInterface, InternetGameJob
 
 
 # Lidraughts.org
@@ -21,65 +21,61 @@ class InternetGameLidraughts(InternetGameInterface):
     def get_identity(self) -> Tuple[str, int, int]:
         return 'Lidraughts.org', BOARD_DRAUGHTS, METHOD_DL
 
-    def assign_game(self, url: str) -> bool:
+    def get_hosts(self) -> List[str]:
+        return ['lidraughts.org']
+
+    def assign_game(self, url: str) -> Optional[InternetGameJob]:
         # Retrieve the ID of the broadcast
         m = self.regexes['broadcast'].match(url)
         if m is not None:
             gid = m.group(1)
             if len(gid) == 8:
-                self.url_type = TYPE_STUDY
-                self.id = gid
-                return True
+                return self.new_job(url, gid, TYPE_STUDY)
 
         # Retrieve the ID of the study
         m = self.regexes['study'].match(url)
         if m is not None:
             gid = m.group(1)
             if len(gid) in [8, 17]:
-                self.url_type = TYPE_STUDY
-                self.id = gid
-                return True
+                return self.new_job(url, gid, TYPE_STUDY)
 
         # Retrieve the ID of the puzzle
         m = self.regexes['puzzle'].match(url)
         if m is not None:
             gid = m.group(1)
             if (gid.isdigit() and gid != '0') or gid == 'daily':
-                self.url_type = TYPE_PUZZLE
-                self.id = gid
-                return True
+                return self.new_job(url, gid, TYPE_PUZZLE)
 
         # Retrieve the ID of the game
         m = self.regexes['game'].match(url)
         if m is not None:
             gid = m.group(2)
             if len(gid) == 8:
-                self.url_type = TYPE_GAME
-                self.id = gid
-                return True
+                return self.new_job(url, gid, TYPE_GAME)
 
         # Nothing found
-        return False
+        return None
 
-    def download_game(self) -> Optional[str]:
+    def download_game(self, job: Optional[InternetGameJob] = None) -> Optional[str]:
         # Check
-        if self.id is None:
+        job = job or self.last_job
+        if job is None:
             return None
 
         # Logic for the games
-        if self.url_type == TYPE_GAME:
-            url = 'https://lidraughts.org/game/export/%s?literate=1' % self.id
+        if job.url_type == TYPE_GAME:
+            url = 'https://lidraughts.org/game/export/%s?literate=1' % job.id
             return self.download(url)
 
         # Logic for the studies
-        if self.url_type == TYPE_STUDY:
-            url = 'https://lidraughts.org/study/%s.pdn' % self.id
+        if job.url_type == TYPE_STUDY:
+            url = 'https://lidraughts.org/study/%s.pdn' % job.id
             return self.download(url)
 
         # Logic for the puzzles
-        if self.url_type == TYPE_PUZZLE:
+        if job.url_type == TYPE_PUZZLE:
             # Fetch the puzzle
-            page = self.download('https://lidraughts.org/training/%s' % self.id)
+            page = self.download('https://lidraughts.org/training/%s' % job.id)
             if page is None:
                 return None
 
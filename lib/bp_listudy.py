@@ -7,7 +7,7 @@ from urllib.parse import urlparse
 import chess
 
 from lib.const import BOARD_CHESS, METHOD_HTML
-from lib.bp_interface import InternetGameInterface
+from lib.bp_interface import InternetGameInterface, InternetGameJob
 
 
 # Listudy.org
@@ -15,24 +15,27 @@ class InternetGameListudy(InternetGameInterface):
     def get_identity(self) -> Tuple[str, int, int]:
         return 'Listudy.org', BOARD_CHESS, METHOD_HTML
 
-    def assign_game(self, url: str) -> bool:
+    def get_hosts(self) -> List[str]:
+        return ['listudy.org']
+
+    def assign_game(self, url: str) -> Optional[InternetGameJob]:
         # Verify the hostname
         parsed = urlparse(url)
         if parsed.netloc.lower() not in ['www.listudy.org', 'listudy.org']:
-            return False
+            return None
 
         # Refactor the direct link
         for key in parsed.path.split('/'):
             if key.isdigit() and (key != '0'):
-                self.id = url
-                return True
-        return False
+                return self.new_job(url, url)
+        return None
 
-    def download_game(self) -> Optional[str]:
+    def download_game(self, job: Optional[InternetGameJob] = None) -> Optional[str]:
         # Download
-        if self.id is None:
+        job = job or self.last_job
+        if job is None:
             return None
-        page = self.download(self.id)
+        page = self.download(job.id)
         if page is None:
             return None
 
@@ -3,11 +3,12 @@
 # GPL version 3
 
 from typing import Optional, List, Tuple
+import logging
 import re
 from urllib.parse import urlparse, parse_qs
 
 from lib.const import BOARD_CHESS, METHOD_API
-from lib.bp_interface import InternetGameInterface
+from lib.bp_interface import InternetGameInterface, InternetGameJob
 
 
 # LiveChess.aunz.net
@@ -19,22 +20,26 @@ class InternetGameLivechessAunz(InternetGameInterface):
     def get_identity(self) -> Tuple[str, int, int]:
         return 'LiveChess.aunz.net', BOARD_CHESS, METHOD_API
 
-    def assign_game(self, url: str) -> bool:
+    def get_hosts(self) -> List[str]:
+        return ['livechess.aunz.net']
+
+    def assign_game(self, url: str) -> Optional[InternetGameJob]:
         return self.reacts_to(url, 'livechess.aunz.net')
 
-    def download_game(self) -> Optional[str]:
+    def download_game(self, job: Optional[InternetGameJob] = None) -> Optional[str]:
         # Check
-        if self.id is None:
+        job = job or self.last_job
+        if job is None:
             return None
 
         # Download the page
-        page = self.download(self.id)
+        page = self.download(job.id)
         if page is None:
-            page = 'src="%s"' % self.id
+            page = 'src="%s"' % job.id
 
         # Find the game ID
         gid = None
-        for url in [self.id] + self.regexes['src'].findall(page):
+        for url in [job.id] + self.regexes['src'].findall(page):
             parsed = urlparse(url)
             if parsed.netloc.lower() == 'livechess.aunz.net':
                 args = parse_qs(parsed.query)
@@ -52,18 +57,20 @@ class InternetGameLivechessAunz(InternetGameInterface):
         if (headers is None) or (len(headers) == 0):
             return None
 
-        # Fetch the games
-        buffer = ''
-        for i in range(len(headers)):
-            api = 'https://livechess.aunz.net/viewer/chess.php?t=%s&getGameDetails=1&pgnFile=%s.LOCAL_FILE&gameIndex=%d' % (gid, gid, i)
-            bourne = self.send_xhr(api, None)
-            data = self.json_loads(bourne)
-            if data is None:
-                continue
+        # Fetch the games in parallel
+        api = 'https://livechess.aunz.net/viewer/chess.php?t=%s&getGameDetails=1&pgnFile=%s.LOCAL_FILE&gameIndex=%%d' % (gid, gid)
+        details = self.map_concurrently(lambda i: self.json_loads(self.send_xhr(api % i, None)), range(len(headers)))
+        failures = [str(i) for i, data in enumerate(details) if not isinstance(data, dict)]
+        if len(failures) > 0:
+            logging.warning('LiveChess.aunz.net: %d of %d games not downloaded for %s (indexes %s)', len(failures), len(details), gid, ', '.join(failures))
 
-            # Build the game
+        # Build the games in their order
+        chunks = []
+        for data in details:
+            if not isinstance(data, dict):
+                continue
             game = {}
-            game['_url'] = self.id
+            game['_url'] = job.id
             for k in ['Event', 'Site', 'Date', 'Round', 'White', 'Black', 'Result', 'TimeControl']:
                 game[k] = self.json_field(data, k.lower())
 
@@ -73,8 +80,8 @@ class InternetGameLivechessAunz(InternetGameInterface):
                 game['_moves'] += '%s ' % self.json_field(moves[k], 'white/move')
                 game['_moves'] += '%s ' % self.json_field(moves[k], 'black/move')
 
-            buffer += self.rebuild_pgn(game) + '\n\n'
-        return buffer
+            chunks.append(self.rebuild_pgn(game) + '\n\n')
+        return ''.join(chunks)
 
     def get_test_links(self) -> List[Tuple[str, bool]]:
         return [('https://livechess.aunz.net/oceania-zonal-2023-playoffs/', True),                                                          # Tournament (short)
@@ -2,14 +2,13 @@
 # https://github.com/ecrucru/boards
 # GPL version 3
 
-from typing import Optional, List, Tuple
+from typing import Optional, Any, Dict, List, Tuple
 import re
 from urllib.parse import urlparse
-import chess
 from datetime import datetime
 
 from lib.const import BOARD_CHESS, METHOD_API, CHESS960, CHESS960_CLASSICAL
-from lib.bp_interface import InternetGameInterface
+from lib.bp_interface import InternetGameInterface, InternetGameJob
 
 
 # LiveChessCloud.com
@@ -21,100 +20,168 @@ class InternetGameLivechesscloud(InternetGameInterface):
     def get_identity(self) -> Tuple[str, int, int]:
         return 'LiveChessCloud.com', BOARD_CHESS, METHOD_API
 
-    def assign_game(self, url: str) -> bool:
+    def get_hosts(self) -> List[str]:
+        return ['livechesscloud.com']
+
+    def assign_game(self, url: str) -> Optional[InternetGameJob]:
         # Verify the hostname
         parsed = urlparse(url)
         if parsed.netloc.lower() != 'view.livechesscloud.com':
-            return False
+            return None
 
         # Verify the identifier
         gid = parsed.path[1:] or parsed.fragment
         if self.regexes['id'].match(gid) is not None:
-            self.id = gid
-            return True
-        return False
-
-    def download_game(self) -> Optional[str]:
-        # Check
-        if self.id is None:
-            return None
+            return self.new_job(url, gid)
+        return None
 
+    def fetch_tournament(self, gid: str) -> Optional[Tuple[str, Dict[str, str], int]]:
+        ''' Return the host of the tournament GID, the common tags of its games and its number of rounds. '''
         # Fetch the host
-        bourne = self.send_xhr('https://lookup.livechesscloud.com/meta/' + self.id, None)
+        bourne = self.send_xhr('https://lookup.livechesscloud.com/meta/' + gid, None)
         data = self.json_loads(bourne)
         host = self.json_field(data, 'host')
         if host == '' or (self.json_field(data, 'format') != '1'):
             return None
 
         # Fetch the tournament
-        pgn = ''
-        bourne = self.send_xhr('https://%s/get/%s/tournament.json' % (host, self.id), None)
+        bourne = self.send_xhr('https://%s/get/%s/tournament.json' % (host, gid), None)
         data = self.json_loads(bourne)
-        game = {'TimeControl': self.json_field(data, 'timecontrol').replace('"', '').replace("'", ''),
-                'Event': self.json_field(data, 'name'),
-                'Site': ('%s %s' % (self.json_field(data, 'country'), self.json_field(data, 'location'))).strip()}
+        header = {'TimeControl': self.json_field(data, 'timecontrol').replace('"', '').replace("'", ''),
+                  'Event': self.json_field(data, 'name'),
+                  'Site': ('%s %s' % (self.json_field(data, 'country'), self.json_field(data, 'location'))).strip()}
         variant = self.json_field(data, 'rules')
         if variant != 'STANDARD':
-            game['Variant'] = variant
+            header['Variant'] = variant
         nb_rounds = len(self.json_field(data, 'rounds', []))
         if nb_rounds == 0:
             return None
+        return host, header, nb_rounds
+
+    def build_game(self, header: Dict[str, str], rnd: int, board: int, game_date: str, pairing: Dict, data: Optional[Dict]) -> Optional[str]:
+        ''' Return the PGN of the game at the BOARD of the round RND, from its PAIRING and its DATA. '''
+        # Players and result
+        game: Dict[str, Any] = dict(header)
+        player = pairing.get('white', {})
+        game['White'] = ('%s, %s' % (self.json_field(player, 'lname'), self.json_field(player, 'fname'))).strip()
+        player = pairing.get('black', {})
+        game['Black'] = ('%s, %s' % (self.json_field(player, 'lname'), self.json_field(player, 'fname'))).strip()
+        game['Result'] = self.json_field(pairing, 'result', '*')
+        game['Round'] = '%d.%d' % (rnd, board)
+
+        # Moves
+        game['_moves'] = ''
+        if self.json_field(data, 'result') in ['', 'NOTPLAYED']:
+            return None
+        tstamp = self.safe_int(self.json_field(data, 'firstMove'))
+        game['Date'] = datetime.fromtimestamp(tstamp // 1000).strftime('%Y.%m.%d') if tstamp > 0 else game_date
+        fischer_id = self.json_field(data, 'chess960', CHESS960_CLASSICAL)
+        if fischer_id == CHESS960_CLASSICAL:
+            game.pop('Variant', None)
+        else:
+            import chess        # Only Chess960 needs it
+            game['Variant'] = CHESS960
+            game['SetUp'] = '1'
+            game['FEN'] = chess.Board.from_chess960_pos(fischer_id).fen()
+        game['_reason'] = self.json_field(data, 'comment')
+        moves = self.json_field(data, 'moves')
+        for move_number, move in enumerate(moves):
+            if ' ' in move:
+                move, clock = move.split(' ', 1)
+            else:
+                clock = ''
+            if move_number % 2 == 0:
+                game['_moves'] += str(move_number // 2 + 1) + '. '
+            game['_moves'] += '%s ' % move
+            clock = clock.split('+', 1)[0]
+            if (clock != '') and (clock[0] not in ['+', '~']):
+                game['_moves'] += '{[%%clk %02d:%02d:%02d]} ' % self.seconds2clock(clock)
+
+        # Game
+        candidate = self.rebuild_pgn(game)
+        return None if candidate is None else candidate.strip()
+
+    def download_game(self, job: Optional[InternetGameJob] = None) -> Optional[str]:
+        # Check
+        job = job or self.last_job
+        if job is None:
+            return None
 
-        # Fetch the rounds
-        for i in range(1, nb_rounds + 1):
-            bourne = self.send_xhr('https://%s/get/%s/round-%d/index.json' % (host, self.id, i), None)
-            data = self.json_loads(bourne)
+        # Fetch the tournament
+        tournament = self.fetch_tournament(job.id)
+        if tournament is None:
+            return None
+        host, header, nb_rounds = tournament
+
+        # Fetch the rounds in parallel
+        rounds = self.map_concurrently(lambda i: self.json_loads(self.send_xhr('https://%s/get/%s/round-%d/index.json' % (host, job.id, i), None)),
+                                       range(1, nb_rounds + 1))
+        boards = []
+        for i, data in enumerate(rounds, 1):
+            if not isinstance(data, dict):
+                continue
             game_date = self.json_field(data, 'date')
-            pairings = self.json_field(data, 'pairings', [])
-            nb_pairings = len(pairings)
-            if nb_pairings > 0:
-                for j in range(nb_pairings):
-                    # Players and result
-                    player = pairings[j].get('white', {})
-                    game['White'] = ('%s, %s' % (self.json_field(player, 'lname'), self.json_field(player, 'fname'))).strip()
-                    player = pairings[j].get('black', {})
-                    game['Black'] = ('%s, %s' % (self.json_field(player, 'lname'), self.json_field(player, 'fname'))).strip()
-                    game['Result'] = self.json_field(pairings[j], 'result', '*')
-                    game['Round'] = '%d.%d' % (i, j + 1)
-
-                    # Fetch the moves
-                    game['_moves'] = ''
-                    bourne2 = self.send_xhr('https://%s/get/%s/round-%d/game-%d.json?poll=' % (host, self.id, i, j + 1), None)
-                    data2 = self.json_loads(bourne2)
-                    if self.json_field(data2, 'result') in ['', 'NOTPLAYED']:
-                        continue
-                    tstamp = self.safe_int(self.json_field(data2, 'firstMove'))
-                    game['Date'] = datetime.fromtimestamp(tstamp // 1000).strftime('%Y.%m.%d') if tstamp > 0 else game_date
-                    fischer_id = self.json_field(data2, 'chess960', CHESS960_CLASSICAL)
-                    if fischer_id == CHESS960_CLASSICAL:
-                        for k in ['Variant', 'SetUp', 'FEN']:
-                            if k in game:
-                                del game[k]
-                    else:
-                        game['Variant'] = CHESS960
-                        game['SetUp'] = '1'
-                        game['FEN'] = chess.Board.from_chess960_pos(fischer_id).fen()
-                    game['_reason'] = self.json_field(data2, 'comment')
-                    moves = self.json_field(data2, 'moves')
-                    for move_number, move in enumerate(moves):
-                        if ' ' in move:
-                            move, clock = move.split(' ', 1)
-                        else:
-                            clock = ''
-                        if move_number % 2 == 0:
-                            game['_moves'] += str(move_number // 2 + 1) + '. '
-                        game['_moves'] += '%s ' % move
-                        clock = clock.split('+', 1)[0]
-                        if (clock != '') and (clock[0] not in ['+', '~']):
-                            game['_moves'] += '{[%%clk %02d:%02d:%02d]} ' % self.seconds2clock(clock)
-
-                    # Game
-                    candidate = self.rebuild_pgn(game)
-                    if candidate is not None:
-                        pgn += candidate.strip() + '\n\n'
+            for j, pairing in enumerate(self.json_field(data, 'pairings', [])):
+                boards.append((i, j + 1, game_date, pairing))
+
+        # Fetch all the games in parallel, then assemble them by round and board
+        games = self.map_concurrently(lambda b: self.json_loads(self.send_xhr('https://%s/get/%s/round-%d/game-%d.json?poll=' % (host, job.id, b[0], b[1]), None)),
+                                      boards)
+        chunks = []
+        for (i, j, game_date, pairing), data in zip(boards, games):
+            candidate = self.build_game(header, i, j, game_date, pairing, data if isinstance(data, dict) else None)
+            if candidate is not None:
+                chunks.append(candidate + '\n\n')
 
         # Return the games
-        return pgn
+        return ''.join(chunks)
+
+    def follow_game(self, job: InternetGameJob, state: Dict[str, Any]) -> Optional[List[str]]:
+        # Fetch the tournament once
+        if 'host' not in state:
+            tournament = self.fetch_tournament(job.id)
+            if tournament is None:
+                return None
+            state['host'], state['header'], state['rounds'] = tournament
+            state['games'] = {}                 # (round, board) -> (PGN, final result)
+            state['over'] = set()               # Rounds whose games all have a final result
+        host = state['host']
+        games = state['games']
+
+        # Poll the round indexes that are not over
+        live = [i for i in range(1, state['rounds'] + 1) if i not in state['over']]
+        if len(live) == 0:
+            return None
+        rounds = self.map_concurrently(lambda i: self.json_loads(self.send_xhr('https://%s/get/%s/round-%d/index.json' % (host, job.id, i), None)),
+                                       live)
+        boards = []
+        for i, data in zip(live, rounds):
+            if not isinstance(data, dict):
+                continue
+            game_date = self.json_field(data, 'date')
+            pairings = self.json_field(data, 'pairings', [])
+            for j, pairing in enumerate(pairings):
+                if not games.get((i, j + 1), ('', False))[1]:
+                    boards.append((i, j + 1, game_date, pairing))
+            if (len(pairings) > 0) and all(self.json_field(p, 'result', '*') != '*' for p in pairings):
+                state['over'].add(i)             # The remaining games are polled a last time
+
+        # Poll the ongoing games only and emit the changes
+        data = self.map_concurrently(lambda b: self.json_loads(self.send_xhr('https://%s/get/%s/round-%d/game-%d.json?poll=' % (host, job.id, b[0], b[1]), None)),
+                                     boards)
+        changes = []
+        for (i, j, game_date, pairing), game in zip(boards, data):
+            if not isinstance(game, dict):
+                state['over'].discard(i)        # Try again at the next poll
+                continue
+            candidate = self.build_game(state['header'], i, j, game_date, pairing, game)
+            if candidate is None:
+                continue
+            final = self.json_field(pairing, 'result', '*') != '*'
+            if candidate != games.get((i, j), ('', False))[0]:
+                changes.append(candidate)
+            games[(i, j)] = (candidate, final)
+        return changes
 
     def get_test_links(self) -> List[Tuple[str, bool]]:
         return [('https://view.livechesscloud.com/30d54b79-e852-4788-bb91-403955efd6a3', True),     # Games
@@ -7,7 +7,7 @@ from typing import Optional, List, Tuple
 from urllib.parse import urlparse, parse_qs
 
 from lib.const import BOARD_CHESS, BOARD_DRAUGHTS, BOARD_GO, BOARD_MILL, METHOD_DL
-from lib.bp_interface import InternetGameInterface
+from lib.bp_interface import InternetGameInterface, InternetGameJob
 
 
 # PlayOK.com
@@ -15,11 +15,14 @@ class InternetGamePlayokInterface(InternetGameInterface):
     def get_identity(self) -> Tuple[str, int, int]:
         return 'PlayOK.com', self.boardType, METHOD_DL
 
-    def assign_game(self, url: str) -> bool:
+    def get_hosts(self) -> List[str]:
+        return ['playok.com']
+
+    def assign_game(self, url: str) -> Optional[InternetGameJob]:
         # Verify the hostname
         parsed = urlparse(url)
         if parsed.netloc.lower() not in ['www.playok.com', 'playok.com']:
-            return False
+            return None
 
         # Read the arguments
         args = parse_qs(parsed.query)
@@ -28,13 +31,13 @@ class InternetGamePlayokInterface(InternetGameInterface):
             if gid[:2] == self.parameter:
                 gid = gid[2:].replace('.txt', '')
                 if gid.isdigit() and (gid != '0'):
-                    self.id = gid
-                    return True
-        return False
+                    return self.new_job(url, gid)
+        return None
 
-    def download_game(self) -> Optional[str]:
-        if self.id is not None:
-            pgn = self.download('https://www.playok.com/p/?g=%s%s.txt' % (self.parameter, self.id))
+    def download_game(self, job: Optional[InternetGameJob] = None) -> Optional[str]:
+        job = job or self.last_job
+        if job is not None:
+            pgn = self.download('https://www.playok.com/p/?g=%s%s.txt' % (self.parameter, job.id))
             if (pgn is not None) and (len(pgn) > 16):
                 return pgn
         return None
@@ -7,8 +7,8 @@ from typing import Optional, List, Tuple
 import re
 
 from lib.const import BOARD_CHESS, METHOD_WS
-from lib.bp_interface import InternetGameInterface
-from lib.ws import InternetWebsockets
+from lib.bp_interface import InternetGameInterface, InternetGameJob
+from lib.ws import InternetWebsocketsMux
 
 
 # Pychess.org
@@ -16,40 +16,46 @@ class InternetGamePychess(InternetGameInterface):
     def __init__(self):
         InternetGameInterface.__init__(self)
         self.regexes.update({'url': re.compile(r'https?:\/\/(www\.)?pychess(-variants\.herokuapp\.com|\.org)\/([a-z0-9]+)[\/\?\#]?', re.IGNORECASE)})
+        self.mux = InternetWebsocketsMux('wss://www.pychess.org/wsr', self.route, timeout=10.0)
 
     def get_identity(self) -> Tuple[str, int, int]:
         return 'Pychess.org', BOARD_CHESS, METHOD_WS
 
-    def assign_game(self, url: str) -> bool:
+    def get_hosts(self) -> List[str]:
+        return ['pychess.org', 'pychess-variants.herokuapp.com']
+
+    def assign_game(self, url: str) -> Optional[InternetGameJob]:
         # Retrieve the ID of the game
         m = self.regexes['url'].match(url)
         if m is not None:
             gid = m.group(3)
             if len(gid) == 8:
-                self.id = gid
-                return True
+                return self.new_job(url, gid)
 
         # Nothing found
-        return False
+        return None
+
+    def route(self, data: str) -> Optional[str]:
+        ''' Return the identifier of the game described by a message of the websocket. '''
+        data = self.json_loads(data)
+        if (data is not None) and (data.get('type') == 'board'):
+            return data.get('gameId')
+        return None
+
+    async def download_game(self, job: Optional[InternetGameJob] = None) -> Optional[str]:
+        job = job or self.last_job
+        if job is None:
+            return None
+
+        # Request the game through the websocket shared by all the downloads
+        data = await self.mux.request(job.id, '{"type":"board","gameId":"%s"}' % job.id)
+        data = self.json_loads(data)
+        if (data is None) or (data.get('pgn', '') == ''):
+            return None
+        return data['pgn']
 
-    async def download_game(self) -> Optional[str]:
-        result = None
-        data = None
-        if self.id is not None:
-            # Open a websocket to retrieve the game
-            ws = await InternetWebsockets().connect('wss://www.pychess.org/wsr')
-            try:
-                await ws.send('{"type":"board","gameId":"%s"}' % self.id)
-                for _ in range(5):
-                    async for data in ws.recv():
-                        data = self.json_loads(data)
-                    if data is not None:
-                        if data['type'] == 'board' and data['gameId'] == self.id:
-                            result = data['pgn'] if data['pgn'] != '' else None
-                            break
-            finally:
-                await ws.close()
-        return result
+    async def shutdown(self) -> None:
+        await self.mux.close()
 
     def get_test_links(self) -> List[Tuple[str, bool]]:
         return [('http://pychess.org/LDSVAvL2#tag', True),                  # Crazyhouse
@@ -8,7 +8,7 @@ from urllib.parse import urlparse, parse_qs
 from html.parser import HTMLParser
 
 from lib.const import BOARD_CHESS, METHOD_HTML, TYPE_GAME, TYPE_PUZZLE
-from lib.bp_interface import InternetGameInterface
+from lib.bp_interface import InternetGameInterface, InternetGameJob
 
 
 # RedHotPawn.com
@@ -16,11 +16,14 @@ class InternetGameRedhotpawn(InternetGameInterface):
     def get_identity(self) -> Tuple[str, int, int]:
         return 'RedHotPawn.com', BOARD_CHESS, METHOD_HTML
 
-    def assign_game(self, url: str) -> bool:
+    def get_hosts(self) -> List[str]:
+        return ['redhotpawn.com']
+
+    def assign_game(self, url: str) -> Optional[InternetGameJob]:
         # Verify the URL
         parsed = urlparse(url)
         if parsed.netloc.lower() not in ['www.redhotpawn.com', 'redhotpawn.com']:
-            return False
+            return None
 
         # Verify the path
         ppl = parsed.path.lower()
@@ -30,36 +33,33 @@ class InternetGameRedhotpawn(InternetGameInterface):
         elif 'chess-puzzle-' in ppl:
             ttype = TYPE_PUZZLE
             if 'chess-puzzle-serve' in url.lower():
-                self.url_type = ttype
-                self.id = url
-                return True
+                return self.new_job(url, url, ttype)
             key = 'puzzleid'
         else:
-            return False
+            return None
 
         # Read the arguments
         args = parse_qs(parsed.query)
         if key in args:
             gid = args[key][0]
             if gid.isdigit() and gid != '0':
-                self.url_type = ttype
-                self.id = gid
-                return True
-        return False
+                return self.new_job(url, gid, ttype)
+        return None
 
-    def download_game(self) -> Optional[str]:
+    def download_game(self, job: Optional[InternetGameJob] = None) -> Optional[str]:
         # Download
-        if self.id is None:
+        job = job or self.last_job
+        if job is None:
             return None
-        if self.url_type == TYPE_GAME:
-            url = 'https://www.redhotpawn.com/pagelet/view/game-pgn.php?gameid=%s' % self.id
-        elif self.url_type == TYPE_PUZZLE:
-            if '://' in self.id:
-                url = self.id
+        if job.url_type == TYPE_GAME:
+            url = 'https://www.redhotpawn.com/pagelet/view/game-pgn.php?gameid=%s' % job.id
+        elif job.url_type == TYPE_PUZZLE:
+            if '://' in job.id:
+                url = job.id
                 event = 'Puzzle'
             else:
-                url = 'https://www.redhotpawn.com/chess-puzzles/chess-puzzle-solve.php?puzzleid=%s' % self.id
-                event = 'Puzzle %s' % self.id
+                url = 'https://www.redhotpawn.com/chess-puzzles/chess-puzzle-solve.php?puzzleid=%s' % job.id
+                event = 'Puzzle %s' % job.id
         else:
             return None
         page = self.download(url)
@@ -67,7 +67,7 @@ class InternetGameRedhotpawn(InternetGameInterface):
             return None
 
         # Logic for the games
-        if self.url_type == TYPE_GAME:
+        if job.url_type == TYPE_GAME:
             # Parser
             class redhotpawnparser(HTMLParser):
                 def __init__(self):
@@ -89,7 +89,7 @@ class InternetGameRedhotpawn(InternetGameInterface):
             return parser.pgn.strip()
 
         # Logic for the puzzles
-        if self.url_type == TYPE_PUZZLE:
+        if job.url_type == TYPE_PUZZLE:
             pos1 = page.find('var g_startFenStr')
             if pos1 != -1:
                 pos1 = page.find("'", pos1)
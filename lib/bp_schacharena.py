@@ -9,7 +9,7 @@ from urllib.parse import unquote
 import chess
 
 from lib.const import BOARD_CHESS, METHOD_HTML
-from lib.bp_interface import InternetGameInterface
+from lib.bp_interface import InternetGameInterface, InternetGameJob
 
 
 # SchachArena.de
@@ -23,16 +23,20 @@ class InternetGameSchacharena(InternetGameInterface):
     def get_identity(self) -> Tuple[str, int, int]:
         return 'SchachArena.de', BOARD_CHESS, METHOD_HTML
 
-    def assign_game(self, url: str) -> bool:
+    def get_hosts(self) -> List[str]:
+        return ['schacharena.de']
+
+    def assign_game(self, url: str) -> Optional[InternetGameJob]:
         return self.reacts_to(url, 'schacharena.de')
 
-    def download_game(self) -> Optional[str]:
+    def download_game(self, job: Optional[InternetGameJob] = None) -> Optional[str]:
         # Check
-        if self.id is None:
+        job = job or self.last_job
+        if job is None:
             return None
 
         # Download page
-        page = self.download(self.id)
+        page = self.download(job.id)
         if page is None:
             return None
 
@@ -41,7 +45,7 @@ class InternetGameSchacharena(InternetGameInterface):
         game = {}
         game['Result'] = '*'
         game['_moves'] = ''
-        game['_url'] = self.id
+        game['_url'] = job.id
         board = chess.Board()
         lines = page.split("\n")
         for line in lines:
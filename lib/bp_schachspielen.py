@@ -8,7 +8,7 @@ import re
 from html.parser import HTMLParser
 
 from lib.const import BOARD_CHESS, METHOD_HTML, CHESS960
-from lib.bp_interface import InternetGameInterface
+from lib.bp_interface import InternetGameInterface, InternetGameJob
 
 
 # Schach-Spielen.eu
@@ -20,20 +20,23 @@ class InternetGameSchachspielen(InternetGameInterface):
     def get_identity(self) -> Tuple[str, int, int]:
         return 'Schach-Spielen.eu', BOARD_CHESS, METHOD_HTML
 
-    def assign_game(self, url: str) -> bool:
+    def get_hosts(self) -> List[str]:
+        return ['schach-spielen.eu']
+
+    def assign_game(self, url: str) -> Optional[InternetGameJob]:
         m = self.regexes['url'].match(url)
         if m is not None:
             gid = m.group(3)
             if len(gid) == 8:
-                self.id = gid
-                return True
-        return False
+                return self.new_job(url, gid)
+        return None
 
-    def download_game(self) -> Optional[str]:
+    def download_game(self, job: Optional[InternetGameJob] = None) -> Optional[str]:
         # Download
-        if self.id is None:
+        job = job or self.last_job
+        if job is None:
             return None
-        page = self.download('https://www.schach-spielen.eu/analyse/%s' % self.id)
+        page = self.download('https://www.schach-spielen.eu/analyse/%s' % job.id)
         if page is None:
             return None
 
@@ -6,7 +6,7 @@ from typing import Optional, List, Tuple
 from urllib.parse import urlparse, parse_qs
 
 from lib.const import BOARD_CHESS, METHOD_DL
-from lib.bp_interface import InternetGameInterface
+from lib.bp_interface import InternetGameInterface, InternetGameJob
 
 
 # SchemingMind.com
@@ -14,11 +14,14 @@ class InternetGameSchemingmind(InternetGameInterface):
     def get_identity(self) -> Tuple[str, int, int]:
         return 'SchemingMind.com', BOARD_CHESS, METHOD_DL
 
-    def assign_game(self, url: str) -> bool:
+    def get_hosts(self) -> List[str]:
+        return ['schemingmind.com']
+
+    def assign_game(self, url: str) -> Optional[InternetGameJob]:
         # Verify the host
         parsed = urlparse(url)
         if parsed.netloc.lower() not in ['www.schemingmind.com', 'schemingmind.com']:
-            return False
+            return None
 
         # Read the identifier
         if 'game.aspx' in parsed.path:
@@ -26,13 +29,13 @@ class InternetGameSchemingmind(InternetGameInterface):
             if 'game_id' in args:
                 gid = args['game_id'][0]
                 if gid.isdigit() and (gid != '0'):
-                    self.id = gid
-                    return True
-        return False
+                    return self.new_job(url, gid)
+        return None
 
-    def download_game(self) -> Optional[str]:
-        if self.id is not None:
-            return self.download('https://www.schemingmind.com/home/game.aspx?game_id=%s&view=3' % self.id)
+    def download_game(self, job: Optional[InternetGameJob] = None) -> Optional[str]:
+        job = job or self.last_job
+        if job is not None:
+            return self.download('https://www.schemingmind.com/home/game.aspx?game_id=%s&view=3' % job.id)
         return None
 
     def get_test_links(self) -> List[Tuple[str, bool]]:
@@ -7,7 +7,7 @@ from typing import Optional, List, Tuple
 import re
 
 from lib.const import BOARD_CHESS, METHOD_DL
-from lib.bp_interface import InternetGameInterface
+from lib.bp_interface import InternetGameInterface, InternetGameJob
 
 
 # TheChessWorld.com
@@ -19,21 +19,25 @@ class InternetGameThechessworld(InternetGameInterface):
     def get_identity(self) -> Tuple[str, int, int]:
         return 'TheChessWorld.com', BOARD_CHESS, METHOD_DL
 
-    def assign_game(self, url: str) -> bool:
+    def get_hosts(self) -> List[str]:
+        return ['thechessworld.com']
+
+    def assign_game(self, url: str) -> Optional[InternetGameJob]:
         return self.reacts_to(url, 'thechessworld.com')
 
-    def download_game(self) -> Optional[str]:
+    def download_game(self, job: Optional[InternetGameJob] = None) -> Optional[str]:
         # Check
-        if self.id is None:
+        job = job or self.last_job
+        if job is None:
             return None
 
         # Find the links
         links = []
-        if self.id.lower().endswith('.pgn'):
-            links.append(self.id)
+        if job.id.lower().endswith('.pgn'):
+            links.append(job.id)
         else:
             # Download the page
-            data = self.download(self.id)
+            data = self.download(job.id)
             if data is None:
                 return None
 
@@ -0,0 +1,181 @@
+# Copyright (C) 2026 ecrucru
+# https://github.com/ecrucru/boards
+# GPL version 3
+
+from typing import Optional, Any, Dict, NamedTuple
+import hashlib
+import json
+import logging
+import os
+import re
+import threading
+from email.utils import parsedate_to_datetime
+from time import time
+
+
+# Response stored on the disk
+class InternetCacheEntry(NamedTuple):
+    body: bytes
+    charset: Optional[str]
+    mime: Optional[str]
+    etag: Optional[str]
+    last_modified: Optional[str]
+    expires: float                      # Timestamp until which the entry is used without revalidation
+
+    def is_fresh(self) -> bool:
+        return time() < self.expires
+
+    def validators(self) -> Dict[str, str]:
+        ''' Return the headers of a conditional request. '''
+        headers = {}
+        if self.etag is not None:
+            headers['If-None-Match'] = self.etag
+        if self.last_modified is not None:
+            headers['If-Modified-Since'] = self.last_modified
+        return headers
+
+
+# Persistent cache of the HTTP responses
+class InternetHttpCache:
+    ''' The responses are stored in the folder of the user (~/.cache/boards by default) and keyed by method, URL, headers and body.
+        The directives of the header Cache-Control are honoured, the stale entries are revalidated with their ETag or
+        their date of modification, and the least recently used entries are evicted above MAX_SIZE bytes. '''
+    def __init__(self, path: Optional[str] = None, max_size: int = 100 * 1024 * 1024):
+        if path is None:
+            path = os.path.join(os.environ.get('XDG_CACHE_HOME') or os.path.join(os.path.expanduser('~'), '.cache'), 'boards')
+        self.path = path
+        self.max_size = max_size
+        self.enabled = True
+        self.lock = threading.Lock()
+        self.size: Optional[int] = None
+
+    def key(self, method: str, url: str, body: Optional[bytes] = None, headers: Optional[Dict[str, str]] = None) -> str:
+        ''' Return the key of a request, the HEADERS of the caller being able to change the response (Accept, Content-Type...). '''
+        h = hashlib.sha256()
+        h.update(method.upper().encode())
+        h.update(b'\n')
+        h.update(url.encode())
+        h.update(b'\n')
+        for name, value in sorted((k.lower(), v) for k, v in (headers or {}).items()):
+            h.update(('%s: %s\n' % (name, value)).encode())
+        h.update(b'\n')
+        h.update(body or b'')
+        return h.hexdigest()
+
+    def filename(self, key: str) -> str:
+        return os.path.join(self.path, key[:2], key)
+
+    def lookup(self, key: str) -> Optional[InternetCacheEntry]:
+        ''' Return the stored response, fresh or stale. '''
+        if not self.enabled:
+            return None
+        fn = self.filename(key)
+        try:
+            with open(fn, 'rb') as f:
+                meta = json.loads(f.readline())
+                body = f.read()
+            os.utime(fn)                                                        # Last use for the eviction
+        except (OSError, ValueError):
+            return None
+        return InternetCacheEntry(body, meta.get('charset'), meta.get('mime'), meta.get('etag'), meta.get('last_modified'), meta.get('expires', 0))
+
+    def store(self, key: str, headers: Any, body: bytes, charset: Optional[str], mime: Optional[str]) -> None:
+        ''' Save the response if its HEADERS allow it. '''
+        if not self.enabled:
+            return
+
+        # Lifetime
+        cc = (headers.get('Cache-Control') or '').lower()
+        if 'no-store' in cc:
+            return
+        etag = headers.get('ETag')
+        last_modified = headers.get('Last-Modified')
+        m = re.search(r'(?:s-)?max-age\s*=\s*(\d+)', cc)
+        if 'no-cache' in cc:
+            lifetime = 0.0
+        elif m is not None:
+            lifetime = float(m.group(1))
+        else:
+            try:
+                lifetime = parsedate_to_datetime(headers.get('Expires')).timestamp() - time()
+            except (TypeError, ValueError):
+                lifetime = 0.0
+        if (lifetime <= 0) and (etag is None) and (last_modified is None):
+            return                                                              # Neither reusable nor revalidable
+
+        # Write atomically
+        meta = {'charset': charset,
+                'mime': mime,
+                'etag': etag,
+                'last_modified': last_modified,
+                'expires': time() + max(0.0, lifetime)}
+        fn = self.filename(key)
+        tmp = '%s.%d.%d' % (fn, os.getpid(), threading.get_ident())
+        try:
+            os.makedirs(os.path.dirname(fn), exist_ok=True)
+            with open(tmp, 'wb') as f:
+                f.write(json.dumps(meta).encode() + b'\n')
+                f.write(body)
+            size = os.path.getsize(tmp)
+            try:
+                size -= os.path.getsize(fn)
+            except OSError:
+                pass
+            os.replace(tmp, fn)
+        except OSError as exception:
+            logging.debug('Cache not writable: %s', str(exception))
+            return
+        self.grow(size)
+
+    def refresh(self, key: str, entry: InternetCacheEntry, headers: Any) -> None:
+        ''' Extend the lifetime of an entry revalidated by the status 304. '''
+        self.store(key, {'Cache-Control': headers.get('Cache-Control'),
+                         'Expires': headers.get('Expires'),
+                         'ETag': headers.get('ETag') or entry.etag,
+                         'Last-Modified': headers.get('Last-Modified') or entry.last_modified,
+                         }, entry.body, entry.charset, entry.mime)
+
+    def files(self) -> Dict[str, os.stat_result]:
+        result = {}
+        for root, _, names in os.walk(self.path):
+            for name in names:
+                fn = os.path.join(root, name)
+                try:
+                    result[fn] = os.stat(fn)
+                except OSError:
+                    pass
+        return result
+
+    def grow(self, size: int) -> None:
+        ''' Account for SIZE more bytes and evict the least recently used entries beyond the limit. '''
+        with self.lock:
+            if self.size is None:
+                self.size = sum(st.st_size for st in self.files().values())
+            else:
+                self.size += size
+            if self.size <= self.max_size:
+                return
+
+            # Down to 90% of the limit to not evict at every call
+            files = self.files()
+            self.size = sum(st.st_size for st in files.values())
+            for fn, st in sorted(files.items(), key=lambda x: x[1].st_mtime):
+                if self.size <= 0.9 * self.max_size:
+                    break
+                try:
+                    os.remove(fn)
+                    self.size -= st.st_size
+                except OSError:
+                    pass
+
+    def clear(self) -> None:
+        with self.lock:
+            for fn in self.files():
+                try:
+                    os.remove(fn)
+                except OSError:
+                    pass
+            self.size = 0
+
+
+http_cache = InternetHttpCache()
@@ -0,0 +1,43 @@
+# Copyright (C) 2026 ecrucru
+# https://github.com/ecrucru/boards
+# GPL version 3
+
+from typing import Optional
+from contextvars import ContextVar
+from time import monotonic
+
+
+# Time budget of a download
+class InternetDeadline:
+    ''' The deadline is started when the URL is submitted to the board providers and it is shared by all their requests.
+        The value None stands for an unlimited budget. '''
+    def __init__(self, seconds: Optional[float] = None):
+        self.expiry = None if seconds is None else monotonic() + seconds
+
+    def remaining(self) -> Optional[float]:
+        ''' Return the remaining seconds, or None if there is no limit. '''
+        if self.expiry is None:
+            return None
+        return max(0.0, self.expiry - monotonic())
+
+    def expired(self) -> bool:
+        return self.remaining() == 0.0
+
+    def allows(self, delay: float) -> bool:
+        ''' Check if a wait of DELAY seconds still leaves time for a request. '''
+        remaining = self.remaining()
+        return (remaining is None) or (delay < remaining)
+
+    def timeout(self, limit: Optional[float] = None) -> Optional[float]:
+        ''' Return the timeout of the next request, capped to LIMIT seconds.
+            TimeoutError is raised when the deadline is over. '''
+        remaining = self.remaining()
+        if remaining == 0.0:
+            raise TimeoutError('Deadline exceeded')
+        if remaining is None:
+            return limit
+        return remaining if limit is None else min(limit, remaining)
+
+
+# Deadline of the download in progress, inherited by the tasks and the threads of the download
+current_deadline: ContextVar[InternetDeadline] = ContextVar('current_deadline', default=InternetDeadline())
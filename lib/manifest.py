@@ -0,0 +1,66 @@
+# Copyright (C) 2026 ecrucru
+# https://github.com/ecrucru/boards
+# GPL version 3
+
+from typing import List, Tuple
+
+from lib.const import BOARD_CHESS, BOARD_DRAUGHTS, BOARD_GO, BOARD_MILL, METHOD_DL, METHOD_HTML, METHOD_API, METHOD_MISC, METHOD_WS
+
+
+# Static description of the board providers by decreasing priority, so that a module of lib/ is imported only when a URL requires it.
+# The entries must match get_identity() and get_hosts() of the classes, what the command "test" verifies.
+#   (module, class, site, board, method, hosts)
+PROVIDERS: List[Tuple[str, str, str, int, int, List[str]]] = [
+    ('bp_lichess', 'InternetGameLichess', 'Lichess.org', BOARD_CHESS, METHOD_MISC, ['lichess.org']),
+    ('bp_lishogi', 'InternetGameLishogi', 'Lishogi.org', BOARD_CHESS, METHOD_MISC, ['lishogi.org']),
+    ('bp_mskchess', 'InternetGameMskchess', 'Mskchess.ru', BOARD_CHESS, METHOD_MISC, ['mskchess.ru']),
+    ('bp_playstrategy', 'InternetGamePlaystrategy', 'Playstrategy.org', BOARD_CHESS, METHOD_MISC, ['playstrategy.org']),
+    ('bp_chesscom', 'InternetGameChessCom', 'Chess.com', BOARD_CHESS, METHOD_MISC, ['chess.com']),
+    ('bp_2700chess', 'InternetGame2700chess', '2700chess.com', BOARD_CHESS, METHOD_HTML, ['2700chess.com']),
+    ('bp_365chess', 'InternetGame365chess', '365chess.com', BOARD_CHESS, METHOD_HTML, ['365chess.com']),
+    ('bp_chessarena', 'InternetGameChessarena', 'ChessArena.com', BOARD_CHESS, METHOD_DL, ['chessarena.com']),
+    ('bp_chessbase', 'InternetGameChessbase', 'ChessBase.com', BOARD_CHESS, METHOD_HTML, ['*']),
+    ('bp_chessbomb', 'InternetGameChessbomb', 'ChessBomb.com', BOARD_CHESS, METHOD_API, ['chess.com', 'chessbomb.com']),
+    ('bp_chessgames', 'InternetGameChessgames', 'ChessGames.com', BOARD_CHESS, METHOD_DL, ['chessgames.com']),
+    ('bp_chessking', 'InternetGameChessking', 'ChessKing.com', BOARD_CHESS, METHOD_DL, ['chessking.com']),
+    ('bp_chessorg', 'InternetGameChessOrg', 'Chess.org', BOARD_CHESS, METHOD_WS, ['chess.org']),
+    ('bp_chesspastebin', 'InternetGameChesspastebin', 'ChessPastebin.com', BOARD_CHESS, METHOD_HTML, ['chesspastebin.com']),
+    ('bp_chesspro', 'InternetGameChesspro', 'ChessPro.ru', BOARD_CHESS, METHOD_HTML, ['chesspro.ru']),
+    ('bp_chesspuzzle', 'InternetGameChesspuzzle', 'ChessPuzzle.net', BOARD_CHESS, METHOD_HTML, ['chesspuzzle.net']),
+    ('bp_chessresults', 'InternetGameChessresults', 'Chess-Results.com', BOARD_CHESS, METHOD_HTML, ['chess-results.com']),
+    ('bp_chesssamara', 'InternetGameChesssamara', 'Chess-Samara.ru', BOARD_CHESS, METHOD_DL, ['chess-samara.ru']),
+    ('bp_chesstempo', 'InternetGameChesstempo', 'ChessTempo.com', BOARD_CHESS, METHOD_WS, ['chesstempo.com']),
+    ('bp_chessvariants', 'InternetGameChessvariants', 'ChessVariants.training', BOARD_CHESS, METHOD_API, ['chessvariants.training']),
+    ('bp_chessvsgpt', 'InternetGameChessvsgpt', 'ChessVsGPT.com', BOARD_CHESS, METHOD_API, ['chessvsgpt.com']),
+    ('bp_echecsonline', 'InternetGameEchecsonline', 'Echecs-Online.eu', BOARD_CHESS, METHOD_DL, ['echecs-online.eu']),
+    ('bp_europeechecs', 'InternetGameEuropeechecs', 'Europe-Echecs.com', BOARD_CHESS, METHOD_DL, ['europe-echecs.com']),
+    ('bp_ficgs', 'InternetGameFicgs', 'Ficgs.com', BOARD_CHESS, METHOD_DL, ['ficgs.com']),
+    ('bp_ficsgames', 'InternetGameFicsgames', 'FicsGames.org', BOARD_CHESS, METHOD_DL, ['ficsgames.org']),
+    ('bp_gameknot', 'InternetGameGameknot', 'GameKnot.com', BOARD_CHESS, METHOD_HTML, ['gameknot.com']),
+    ('bp_gchess', 'InternetGameGchess', 'GChess.com', BOARD_CHESS, METHOD_API, ['gchess.com']),
+    ('bp_greenchess', 'InternetGameGreenchess', 'GreenChess.net', BOARD_CHESS, METHOD_HTML, ['greenchess.net']),
+    ('bp_iccf', 'InternetGameIccf', 'Iccf.com', BOARD_CHESS, METHOD_DL, ['iccf.com']),
+    ('bp_immortal', 'InternetGameImmortal', 'Immortal.game', BOARD_CHESS, METHOD_HTML, ['immortal.game']),
+    ('bp_ideachess', 'InternetGameIdeachess', 'IdeaChess.com', BOARD_CHESS, METHOD_API, ['ideachess.com']),
+    ('bp_listudy', 'InternetGameListudy', 'Listudy.org', BOARD_CHESS, METHOD_HTML, ['listudy.org']),
+    ('bp_livechessaunz', 'InternetGameLivechessAunz', 'LiveChess.aunz.net', BOARD_CHESS, METHOD_API, ['livechess.aunz.net']),
+    ('bp_livechesscloud', 'InternetGameLivechesscloud', 'LiveChessCloud.com', BOARD_CHESS, METHOD_API, ['livechesscloud.com']),
+    ('bp_playok', 'InternetGamePlayokChess', 'PlayOK.com', BOARD_CHESS, METHOD_DL, ['playok.com']),
+    ('bp_playok', 'InternetGamePlayokGo', 'PlayOK.com', BOARD_GO, METHOD_DL, ['playok.com']),
+    ('bp_playok', 'InternetGamePlayokGomoku', 'PlayOK.com', BOARD_GO, METHOD_DL, ['playok.com']),
+    ('bp_playok', 'InternetGamePlayokDraughts8', 'PlayOK.com', BOARD_DRAUGHTS, METHOD_DL, ['playok.com']),
+    ('bp_playok', 'InternetGamePlayokDraughts10', 'PlayOK.com', BOARD_DRAUGHTS, METHOD_DL, ['playok.com']),
+    ('bp_playok', 'InternetGamePlayokMill', 'PlayOK.com', BOARD_MILL, METHOD_DL, ['playok.com']),
+    ('bp_pychess', 'InternetGamePychess', 'Pychess.org', BOARD_CHESS, METHOD_WS, ['pychess.org', 'pychess-variants.herokuapp.com']),
+    ('bp_redhotpawn', 'InternetGameRedhotpawn', 'RedHotPawn.com', BOARD_CHESS, METHOD_HTML, ['redhotpawn.com']),
+    ('bp_schacharena', 'InternetGameSchacharena', 'SchachArena.de', BOARD_CHESS, METHOD_HTML, ['schacharena.de']),
+    ('bp_schachspielen', 'InternetGameSchachspielen', 'Schach-Spielen.eu', BOARD_CHESS, METHOD_HTML, ['schach-spielen.eu']),
+    ('bp_schemingmind', 'InternetGameSchemingmind', 'SchemingMind.com', BOARD_CHESS, METHOD_DL, ['schemingmind.com']),
+    ('bp_thechessworld', 'InternetGameThechessworld', 'TheChessWorld.com', BOARD_CHESS, METHOD_DL, ['thechessworld.com']),
+    ('bp_lidraughts', 'InternetGameLidraughts', 'Lidraughts.org', BOARD_DRAUGHTS, METHOD_DL, ['lidraughts.org']),
+    ('bp_dragongoserver', 'InternetGameDragongoserver', 'DragonGoServer.net', BOARD_GO, METHOD_DL, ['dragongoserver.net']),
+    ('bp_gokgs', 'InternetGameGokgs', 'GoKGS.com', BOARD_GO, METHOD_DL, ['gokgs.com']),
+    ('bp_ingoweb', 'InternetGameIngoweb', 'Ingo-web.com', BOARD_GO, METHOD_DL, ['ingo-web.com']),
+    ('bp_onlinego', 'InternetGameOnlinego', 'Online-go.com', BOARD_GO, METHOD_DL, ['online-go.com']),
+    ('bp_generic_chess', 'InternetGameGenericChess', 'Generic for chess', BOARD_CHESS, METHOD_MISC, ['*']),
+]
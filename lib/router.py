@@ -0,0 +1,60 @@
+# Copyright (C) 2026 ecrucru
+# https://github.com/ecrucru/boards
+# GPL version 3
+
+from typing import Optional, Dict, Iterator, List, Tuple
+from importlib import import_module
+from urllib.parse import urlparse
+
+from lib.bp_interface import InternetGameInterface
+from lib.manifest import PROVIDERS
+
+
+# Index of the board providers by hostname
+class InternetGameRouter:
+    ''' The board providers are indexed once by the hostnames declared in the manifest.
+        A URL is then only submitted to the providers of its host and its parent domains,
+        followed by the providers accepting any host ("*") in their order of registration.
+        The module of a board provider is imported the first time a URL requires it. '''
+    def __init__(self, manifest: Optional[List[Tuple[str, str, str, int, int, List[str]]]] = None):
+        self.manifest = PROVIDERS if manifest is None else manifest
+        self.instances: Dict[int, InternetGameInterface] = {}
+        self.index: Dict[str, List[int]] = {}
+        self.fallback: List[int] = []
+        for i, entry in enumerate(self.manifest):
+            for host in entry[5]:
+                if host == '*':
+                    if i not in self.fallback:
+                        self.fallback.append(i)
+                else:
+                    self.index.setdefault(host.lower(), []).append(i)
+
+    def provider(self, i: int) -> InternetGameInterface:
+        ''' Return the instance of the board provider at the position I of the manifest. '''
+        if i not in self.instances:
+            module, cls = self.manifest[i][:2]
+            self.instances[i] = getattr(import_module('lib.' + module), cls)()
+        return self.instances[i]
+
+    def providers(self) -> List[InternetGameInterface]:
+        ''' Load all the board providers. '''
+        return [self.provider(i) for i in range(len(self.manifest))]
+
+    def loaded(self) -> List[InternetGameInterface]:
+        ''' Return the board providers already imported. '''
+        return list(self.instances.values())
+
+    def candidates(self, url: str) -> Iterator[InternetGameInterface]:
+        ''' Yield the board providers that may handle the URL, by decreasing priority. '''
+        try:
+            host = urlparse(url).hostname or ''
+        except ValueError:
+            host = ''
+
+        # Walk through the parent domains
+        found: List[int] = []
+        labels = host.split('.')
+        for i in range(len(labels) - 1):
+            found += self.index.get('.'.join(labels[i:]), [])
+        for i in sorted(set(found)) + self.fallback:
+            yield self.provider(i)
@@ -0,0 +1,87 @@
+# Copyright (C) 2026 ecrucru
+# https://github.com/ecrucru/boards
+# GPL version 3
+
+from typing import Optional, Any, Awaitable, Callable, Dict, Tuple
+import asyncio
+import logging
+import threading
+
+from lib.deadline import current_deadline
+
+
+# Call in progress shared by the threads
+class InternetFlight:
+    def __init__(self):
+        self.done = threading.Event()
+        self.result: Any = None
+        self.error: Optional[BaseException] = None
+
+
+# Deduplication of the identical calls in progress
+class InternetSingleFlight:
+    ''' The first caller of a KEY executes the function, and the concurrent callers of the same KEY wait for its result
+        instead of repeating the work. The exceptions are shared the same way. Nothing is kept once the call is over.
+        The followers give up when the deadline of their own download is over. '''
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.flights: Dict[str, InternetFlight] = {}
+        self.futures: Dict[Tuple[int, str], asyncio.Future] = {}
+
+    def run(self, key: str, func: Callable[[], Any]) -> Any:
+        ''' Execute FUNC once for all the threads calling it with the same KEY at the same time. '''
+        with self.lock:
+            flight = self.flights.get(key)
+            leader = flight is None
+            if leader:
+                flight = self.flights[key] = InternetFlight()
+
+        # Follower
+        if not leader:
+            logging.debug('Joining the request in progress: %s', key)
+            if not flight.done.wait(current_deadline.get().timeout()):
+                raise TimeoutError('Deadline exceeded')
+            if flight.error is not None:
+                raise flight.error
+            return flight.result
+
+        # Leader
+        try:
+            flight.result = func()
+            return flight.result
+        except BaseException as exception:
+            flight.error = exception
+            raise
+        finally:
+            with self.lock:
+                del self.flights[key]
+            flight.done.set()
+
+    async def run_async(self, key: str, func: Callable[[], Awaitable[Any]]) -> Any:
+        ''' Await FUNC once for all the tasks of the event loop calling it with the same KEY at the same time. '''
+        fkey = (id(asyncio.get_running_loop()), key)
+        future = self.futures.get(fkey)
+
+        # Follower
+        if future is not None:
+            logging.debug('Joining the request in progress: %s', key)
+            return await asyncio.wait_for(asyncio.shield(future), current_deadline.get().timeout())
+
+        # Leader
+        future = self.futures[fkey] = asyncio.get_running_loop().create_future()
+        try:
+            result = await func()
+            future.set_result(result)
+            return result
+        except BaseException as exception:
+            if isinstance(exception, asyncio.CancelledError):
+                future.set_exception(TimeoutError('Shared request cancelled'))
+            else:
+                future.set_exception(exception)
+            future.exception()                                  # No warning if there is no follower
+            raise
+        finally:
+            del self.futures[fkey]
+
+
+flights = InternetSingleFlight()
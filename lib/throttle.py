@@ -0,0 +1,124 @@
+# Copyright (C) 2026 ecrucru
+# https://github.com/ecrucru/boards
+# GPL version 3
+
+from typing import Optional, AsyncIterator, Dict, Iterator, NamedTuple
+import asyncio
+import logging
+import threading
+from contextlib import asynccontextmanager, contextmanager
+from time import monotonic
+
+
+# Limits of a host
+class InternetHostLimit(NamedTuple):
+    rate: float                         # Requests per second
+    burst: float                        # Requests allowed at once after an idle period
+    max_in_flight: int                  # Simultaneous requests
+
+
+# Token bucket of a host
+class InternetHostBucket:
+    def __init__(self, limit: InternetHostLimit):
+        self.limit = limit
+        self.tokens = limit.burst
+        self.stamp = monotonic()
+        self.in_flight = 0
+
+
+# Scheduler of the requests shared by all the board providers
+class InternetThrottle:
+    ''' Every host has a bucket of tokens refilled at a given RATE per second up to BURST tokens, and a maximal number
+        of simultaneous requests. The limit of a domain applies to its subdomains, and the host "*" holds the default limit.
+        The requests wait for their turn instead of failing, from the threads as well as from the event loop. '''
+    def __init__(self, rate: float = 8.0, max_in_flight: int = 4):
+        self.limits: Dict[str, InternetHostLimit] = {}
+        self.buckets: Dict[str, InternetHostBucket] = {}
+        self.lock = threading.Condition()
+        self.configure('*', rate, max_in_flight)
+
+    def configure(self, host: str, rate: float, max_in_flight: int, burst: Optional[float] = None) -> None:
+        ''' Set the limits of the HOST and its subdomains. A RATE of zero disables the limitation of the rate. '''
+        with self.lock:
+            self.limits[host.lower()] = InternetHostLimit(rate, max(1.0, rate if burst is None else burst), max(1, max_in_flight))
+            self.buckets.clear()
+
+    def bucket(self, host: str) -> InternetHostBucket:
+        # Limit of the host or of its closest parent domain, else the default limit for the host alone
+        host = host.lower()
+        labels = host.split('.')
+        key = host
+        limit = self.limits['*']
+        for i in range(len(labels)):
+            domain = '.'.join(labels[i:])
+            if domain in self.limits:
+                key = domain
+                limit = self.limits[domain]
+                break
+        if key not in self.buckets:
+            self.buckets[key] = InternetHostBucket(limit)
+        return self.buckets[key]
+
+    def try_acquire(self, host: str) -> float:
+        ''' Take a slot for the HOST and return zero, else return the delay before the next attempt.
+            The lock must be held by the caller. '''
+        bucket = self.bucket(host)
+        limit = bucket.limit
+        if bucket.in_flight >= limit.max_in_flight:
+            return 0.05
+        if limit.rate > 0:
+            now = monotonic()
+            bucket.tokens = min(limit.burst, bucket.tokens + (now - bucket.stamp) * limit.rate)
+            bucket.stamp = now
+            if bucket.tokens < 1:
+                return (1 - bucket.tokens) / limit.rate
+            bucket.tokens -= 1
+        bucket.in_flight += 1
+        return 0.0
+
+    def release(self, host: str) -> None:
+        with self.lock:
+            bucket = self.bucket(host)
+            bucket.in_flight = max(0, bucket.in_flight - 1)
+            self.lock.notify_all()
+
+    @contextmanager
+    def slot(self, host: Optional[str], timeout: Optional[float] = None) -> Iterator[None]:
+        ''' Wait for a slot of the HOST from a thread, at most TIMEOUT seconds before raising TimeoutError. '''
+        host = host or ''
+        expiry = None if timeout is None else monotonic() + timeout
+        with self.lock:
+            while True:
+                delay = self.try_acquire(host)
+                if delay == 0:
+                    break
+                if (expiry is not None) and (monotonic() + delay > expiry):
+                    raise TimeoutError('Throttled beyond the deadline: %s' % host)
+                logging.debug('Throttling %s for %.2fs', host, delay)
+                self.lock.wait(delay)
+        try:
+            yield
+        finally:
+            self.release(host)
+
+    @asynccontextmanager
+    async def slot_async(self, host: Optional[str], timeout: Optional[float] = None) -> AsyncIterator[None]:
+        ''' Wait for a slot of the HOST without blocking the event loop, at most TIMEOUT seconds before raising TimeoutError. '''
+        host = host or ''
+        expiry = None if timeout is None else monotonic() + timeout
+        while True:
+            with self.lock:
+                delay = self.try_acquire(host)
+            if delay == 0:
+                break
+            if (expiry is not None) and (monotonic() + delay > expiry):
+                raise TimeoutError('Throttled beyond the deadline: %s' % host)
+            logging.debug('Throttling %s for %.2fs', host, delay)
+            await asyncio.sleep(delay)
+        try:
+            yield
+        finally:
+            self.release(host)
+
+
+throttle = InternetThrottle()
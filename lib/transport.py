@@ -0,0 +1,302 @@
+# Copyright (C) 2026 ecrucru
+# https://github.com/ecrucru/boards
+# GPL version 3
+
+from typing import Optional, Any, Dict, List, Tuple
+import asyncio
+import logging
+import random
+import ssl
+import sys
+import threading
+import zlib
+from importlib.util import find_spec
+from email.utils import parsedate_to_datetime
+from io import BytesIO
+from time import monotonic, time
+from http.client import HTTPConnection, HTTPSConnection, HTTPMessage, HTTPResponse, HTTPException
+from urllib.error import HTTPError, URLError
+from urllib.parse import urlparse, urljoin
+from urllib.request import Request, getproxies, urlopen
+
+
+# Content encodings accepted from the servers, the optional module brotli being installed or not
+ACCEPT_ENCODING = 'gzip, deflate, br' if find_spec('brotli') is not None else 'gzip, deflate'
+
+
+# Status codes of the transient errors
+RETRY_STATUS = [408, 425, 429, 500, 502, 503, 504]
+
+
+def retry_delay(exception: BaseException, attempt: int, max_attempts: int, base: float = 0.5, cap: float = 30.0) -> Optional[float]:
+    ''' Return the delay in seconds before the next attempt of a request that failed with the EXCEPTION,
+        or None if the error is permanent or the budget of attempts is spent.
+        The header Retry-After of the server is obeyed up to CAP seconds, else the delay grows exponentially with a jitter. '''
+    if attempt >= max_attempts:
+        return None
+
+    # HTTP errors of urllib and aiohttp
+    status = exception.code if isinstance(exception, HTTPError) else getattr(exception, 'status', None)
+    if isinstance(status, int):
+        if status not in RETRY_STATUS:
+            return None
+        headers = getattr(exception, 'headers', None)
+        value = (headers.get('Retry-After') or '').strip() if headers is not None else ''
+        if value != '':
+            try:
+                delay = float(value) if value.isdigit() else parsedate_to_datetime(value).timestamp() - time()
+                return max(0.0, delay) if delay <= cap else None
+            except (TypeError, ValueError):
+                pass
+
+    # Network errors
+    else:
+        if isinstance(exception, URLError) and isinstance(exception.reason, BaseException):
+            exception = exception.reason
+        transient: Tuple[type, ...] = (ConnectionError, TimeoutError, asyncio.TimeoutError, HTTPException)
+        aiohttp = sys.modules.get('aiohttp')
+        if aiohttp is not None:
+            transient += (aiohttp.ClientConnectionError, aiohttp.ClientPayloadError)
+        if isinstance(exception, ssl.SSLCertVerificationError) or not isinstance(exception, transient):
+            return None
+
+    # Exponential backoff with jitter
+    delay = min(cap, base * 2 ** (attempt - 1))
+    return delay / 2 + random.uniform(0, delay / 2)
+
+
+# Streaming decompression of a body according to its header Content-Encoding
+class InternetDecompressor:
+    def __init__(self, encoding: str):
+        self.encoding = encoding
+        self.started = False
+        if encoding in ['gzip', 'x-gzip']:
+            self.engine: Any = zlib.decompressobj(16 + zlib.MAX_WBITS)
+        elif encoding == 'deflate':
+            self.engine = zlib.decompressobj(zlib.MAX_WBITS)
+        elif encoding == 'br':
+            import brotli
+            self.engine = brotli.Decompressor()
+        else:
+            raise ValueError('Unsupported content encoding: %s' % encoding)
+
+    def decompress(self, chunk: bytes) -> bytes:
+        if self.encoding == 'br':
+            return self.engine.process(chunk)
+        try:
+            data = self.engine.decompress(chunk)
+        except zlib.error:
+            # Some servers send a raw deflate stream without the zlib header
+            if (self.encoding != 'deflate') or self.started:
+                raise
+            self.engine = zlib.decompressobj(-zlib.MAX_WBITS)
+            data = self.engine.decompress(chunk)
+        self.started = True
+        return data
+
+    def flush(self) -> bytes:
+        return b'' if self.encoding == 'br' else self.engine.flush()
+
+
+# Response of a pooled connection, compatible with the object returned by urllib.request.urlopen()
+class InternetPooledResponse:
+    def __init__(self, pool: 'InternetConnectionPool', key: Tuple[str, str, int], conn: HTTPConnection, response: HTTPResponse, url: str):
+        self.pool = pool
+        self.key = key
+        self.conn: Optional[HTTPConnection] = conn
+        self.response = response
+        self.url = url
+        self.status = response.status
+        self.headers = response.msg
+
+    def __enter__(self) -> 'InternetPooledResponse':
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.close()
+
+    def read(self, amt: Optional[int] = None) -> bytes:
+        return self.response.read(amt)
+
+    def read1(self, amt: int = -1) -> bytes:
+        ''' Return the data available at once, without waiting for AMT bytes. '''
+        return self.response.read1(amt)
+
+    def info(self) -> HTTPMessage:
+        return self.response.msg
+
+    def geturl(self) -> str:
+        return self.url
+
+    def getcode(self) -> int:
+        return self.status
+
+    def close(self) -> None:
+        ''' Give the connection back to the pool if the response was fully read, else drop it. '''
+        if self.conn is not None:
+            reusable = self.response.isclosed() and not self.response.will_close
+            self.pool.release(self.key, self.conn, reusable)
+            self.conn = None
+
+
+# Persistent HTTP connections shared by all the board providers
+class InternetConnectionPool:
+    ''' The connections are kept alive per (scheme, host, port) for IDLE_TIMEOUT seconds.
+        A host never gets more than MAX_PER_HOST simultaneous connections: the extra requests wait for a free one.
+        The requests are delegated to urllib when a proxy is configured in the environment. '''
+    def __init__(self, max_per_host: int = 4, idle_timeout: float = 30.0, max_redirects: int = 10):
+        self.max_per_host = max_per_host
+        self.idle_timeout = idle_timeout
+        self.max_redirects = max_redirects
+        self.lock = threading.Condition()
+        self.idle: Dict[Tuple[str, str, int], List[Tuple[float, HTTPConnection]]] = {}
+        self.active: Dict[Tuple[str, str, int], int] = {}
+        self.ssl_context: Optional[ssl.SSLContext] = None
+
+    def acquire(self, key: Tuple[str, str, int], timeout: Any) -> Tuple[HTTPConnection, bool]:
+        ''' Return a connection to the host and whether it was reused.
+            TimeoutError is raised when no connection is free within the TIMEOUT. '''
+        with self.lock:
+            if not self.lock.wait_for(lambda: self.active.get(key, 0) < self.max_per_host, timeout if isinstance(timeout, (int, float)) else None):
+                raise TimeoutError('No free connection to %s' % key[1])
+            self.active[key] = self.active.get(key, 0) + 1
+
+            # Reuse the most recent connection that is not expired
+            idle = self.idle.get(key, [])
+            while len(idle) > 0:
+                since, conn = idle.pop()
+                if monotonic() - since < self.idle_timeout:
+                    conn.timeout = timeout
+                    if conn.sock is not None:
+                        conn.sock.settimeout(timeout)
+                    return conn, True
+                conn.close()
+
+        # New connection
+        scheme, host, port = key
+        if scheme == 'https':
+            if self.ssl_context is None:
+                self.ssl_context = ssl._create_default_https_context()      # Honours the option --unverified-ssl
+            return HTTPSConnection(host, port, timeout=timeout, context=self.ssl_context), False
+        return HTTPConnection(host, port, timeout=timeout), False
+
+    def release(self, key: Tuple[str, str, int], conn: HTTPConnection, reusable: bool) -> None:
+        with self.lock:
+            self.active[key] -= 1
+            if reusable:
+                self.idle.setdefault(key, []).append((monotonic(), conn))
+            else:
+                conn.close()
+            self.lock.notify_all()
+
+    def close(self) -> None:
+        ''' Close the idle connections. '''
+        with self.lock:
+            for idle in self.idle.values():
+                for _, conn in idle:
+                    conn.close()
+            self.idle.clear()
+
+    def urlopen(self, request: Request, timeout: Any = None) -> Any:
+        ''' Execute the REQUEST on a pooled connection, following the redirections.
+            The status codes 4xx and 5xx raise HTTPError like urllib.request.urlopen(). '''
+        if timeout is None:
+            timeout = getattr(request, 'timeout', None)
+        if not request.has_header('Accept-encoding'):
+            request.add_header('Accept-Encoding', ACCEPT_ENCODING)
+        if getproxies():
+            return urlopen(request, timeout=timeout) if timeout is not None else urlopen(request)
+
+        url = request.full_url
+        method = request.get_method()
+        data = request.data
+        headers = dict(request.header_items())
+        if (data is not None) and ('Content-type' not in headers):
+            headers['Content-type'] = 'application/x-www-form-urlencoded'
+        for _ in range(self.max_redirects + 1):
+            # Target
+            parsed = urlparse(url)
+            scheme = parsed.scheme.lower()
+            if (scheme not in ['http', 'https']) or (parsed.hostname is None):
+                raise ValueError('Unsupported URL: %s' % url)
+            key = (scheme, parsed.hostname, parsed.port or (443 if scheme == 'https' else 80))
+            selector = (parsed.path or '/') + ('?' + parsed.query if parsed.query != '' else '')
+
+            # Send the request, once more on a fresh connection if the reused one was closed by the server meanwhile
+            for attempt in range(2):
+                conn, reused = self.acquire(key, timeout)
+                try:
+                    conn.request(method, selector, body=data, headers=headers)
+                    response = conn.getresponse()
+                    break
+                except (HTTPException, ConnectionError) as e:
+                    self.release(key, conn, False)
+                    if not reused or attempt > 0:
+                        raise
+                    logging.debug('Stale connection to %s: %s', key[1], str(e))
+                except Exception:
+                    self.release(key, conn, False)
+                    raise
+
+            # Redirection
+            location = response.getheader('Location')
+            if (response.status in [301, 302, 303, 307, 308]) and (location is not None):
+                reusable = False
+                try:
+                    response.read()
+                    reusable = not response.will_close
+                finally:
+                    self.release(key, conn, reusable)
+                url = urljoin(url, location)
+                if (response.status == 303) or ((response.status in [301, 302]) and (method == 'POST')):
+                    method, data = 'GET', None
+                    headers = {k: v for k, v in headers.items() if k.lower() not in ['content-type', 'content-length']}
+                continue
+
+            # Errors
+            if response.status >= 400:
+                reusable = False
+                try:
+                    body = response.read()
+                    reusable = not response.will_close
+                finally:
+                    self.release(key, conn, reusable)
+                raise HTTPError(url, response.status, response.reason, response.msg, BytesIO(body))
+            return InternetPooledResponse(self, key, conn, response, url)
+        raise HTTPError(url, 310, 'Too many redirections', HTTPMessage(), BytesIO())
+
+
+# Long-lived aiohttp session shared by the asynchronous requests
+class InternetAsyncSession:
+    ''' The module aiohttp is imported on demand, so that the synchronous board providers start faster.
+        The session is bound to the running event loop: the application closes it with close() before the loop ends.
+        The content encodings are negotiated and decompressed by aiohttp itself. '''
+    def __init__(self, max_per_host: int = 4, idle_timeout: float = 30.0):
+        self.max_per_host = max_per_host
+        self.idle_timeout = idle_timeout
+        self.session: Any = None
+        self.loop: Optional[asyncio.AbstractEventLoop] = None
+
+    async def get(self) -> Any:
+        ''' Return the aiohttp.ClientSession of the running loop. '''
+        loop = asyncio.get_running_loop()
+        if (self.session is None) or self.session.closed or (self.loop is not loop):
+            import aiohttp
+            connector = aiohttp.TCPConnector(limit_per_host=self.max_per_host,
+                                             keepalive_timeout=self.idle_timeout,
+                                             ttl_dns_cache=300,
+                                             ssl=ssl._create_default_https_context())     # Honours the option --unverified-ssl
+            self.session = aiohttp.ClientSession(connector=connector, trust_env=True, raise_for_status=True)
+            self.loop = loop
+        return self.session
+
+    async def close(self) -> None:
+        if self.session is not None:
+            if not self.session.closed and (self.loop is asyncio.get_running_loop()):
+                await self.session.close()
+            self.session = None
+            self.loop = None
+
+
+http_pool = InternetConnectionPool()
+http_session = InternetAsyncSession()
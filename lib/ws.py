@@ -2,22 +2,31 @@
 # https://github.com/ecrucru/boards
 # GPL version 3
 
-from typing import Optional, Dict, AsyncIterator
+from typing import Optional, AsyncIterator, Callable, Dict, List, Tuple
+import asyncio
 import logging
+from urllib.parse import urlparse
 import aiohttp
 
+from lib.deadline import InternetDeadline, current_deadline
+from lib.throttle import throttle
+from lib.transport import http_session
+
 
 # Class to handle the websockets as a client via aiohttp following a syntax near to websockets
 class InternetWebsockets():
-    ''' aiohttp @ https://docs.aiohttp.org/en/stable/client_quickstart.html#websockets
+    ''' The websockets borrow the long-lived session of lib.transport, which the application closes with http_session.close().
+
+        aiohttp @ https://docs.aiohttp.org/en/stable/client_quickstart.html#websockets
             from lib.ws import InternetWebsockets
             async def main():
                 ws = await InternetWebsockets().connect('wss://...')    # Exception if failed
                 try:
-                    async for data in ws.recv():
-                        print(data)
-                        # break is mostly useless
+                    data = await ws.recv(timeout=5)                     # asyncio.TimeoutError if nothing is received
                     await ws.send('Hello')
+                    data = await ws.recv_until(lambda data: data.startswith('{'))
+                    async for data in ws:                               # Until the websocket is closed
+                        print(data)
                 finally:
                     await ws.close()
 
@@ -32,25 +41,53 @@ class InternetWebsockets():
                 finally:
                     await ws.close()
     '''
-    def __init__(self):
-        self.acs: Optional[aiohttp.ClientSession] = None
+    def __init__(self, timeout: float = 20.0):
+        self.timeout = timeout                  # Maximal wait in seconds for the connection and for every message
         self.ws: Optional[aiohttp.client_ws.ClientWebSocketResponse] = None
 
     async def connect(self, url: Optional[str], headers: Optional[Dict] = None) -> 'InternetWebsockets':
         if url is not None:
             logging.debug('Websocket connecting to %s', url)
-            self.acs = aiohttp.ClientSession()
-            self.ws = await self.acs.ws_connect(url, headers=headers, heartbeat=None)
+            session = await http_session.get()                      # Shared DNS cache and TLS sessions
+            async with throttle.slot_async(urlparse(url).hostname, current_deadline.get().timeout()):
+                self.ws = await asyncio.wait_for(session.ws_connect(url, headers=headers, heartbeat=None),
+                                                 current_deadline.get().timeout(self.timeout))
         return self
 
-    async def recv(self) -> AsyncIterator[Optional[str]]:
-        result = None
-        if self.ws is not None:
-            async for msg in self.ws:
-                if msg.type == aiohttp.WSMsgType.TEXT:
-                    result = msg.data
+    async def recv(self, timeout: Optional[float] = None) -> Optional[str]:
+        ''' Return the next text message, or None if the websocket is closed.
+            The pings are answered by aiohttp, and the binary messages are skipped.
+            asyncio.TimeoutError is raised if nothing is received within TIMEOUT seconds (by default the timeout of the instance). '''
+        limit = current_deadline.get().timeout(self.timeout if timeout is None else timeout)
+        stop = None if limit is None else asyncio.get_running_loop().time() + limit
+        while self.ws is not None:
+            msg = await asyncio.wait_for(self.ws.receive(), None if stop is None else max(0.0, stop - asyncio.get_running_loop().time()))
+            if msg.type == aiohttp.WSMsgType.TEXT:
+                return msg.data
+            if msg.type in [aiohttp.WSMsgType.CLOSE, aiohttp.WSMsgType.CLOSING, aiohttp.WSMsgType.CLOSED, aiohttp.WSMsgType.ERROR]:
+                logging.debug('Websocket closed by the server')
                 break
-        yield result
+        return None
+
+    async def recv_until(self, predicate: Callable[[str], bool], timeout: Optional[float] = None) -> Optional[str]:
+        ''' Return the first text message satisfying the PREDICATE, or None if the websocket is closed.
+            asyncio.TimeoutError is raised if no such message is received within TIMEOUT seconds. '''
+        limit = current_deadline.get().timeout(self.timeout if timeout is None else timeout)
+        stop = None if limit is None else asyncio.get_running_loop().time() + limit
+        while True:
+            data = await self.recv(None if stop is None else max(0.0, stop - asyncio.get_running_loop().time()))
+            if (data is None) or predicate(data):
+                return data
+
+    def __aiter__(self) -> AsyncIterator[str]:
+        return self
+
+    async def __anext__(self) -> str:
+        ''' Iterate over the text messages until the websocket is closed. '''
+        data = await self.recv()
+        if data is None:
+            raise StopAsyncIteration
+        return data
 
     async def send(self, data: str) -> None:
         if self.ws is not None:
@@ -60,6 +97,115 @@ class InternetWebsockets():
         if self.ws is not None:
             await self.ws.close()
             self.ws = None
-        if self.acs is not None:
-            await self.acs.close()
-            self.acs = None
+
+
+# Class to share one websocket between many requests, the replies being dispatched by key
+class InternetWebsocketsMux():
+    ''' The ROUTE function returns the key of a received message, or None to ignore it.
+        The socket is opened by the first request and closed after IDLE_TIMEOUT seconds without pending request.
+            mux = InternetWebsocketsMux('wss://...', lambda data: json.loads(data).get('id'))
+            reply = await mux.request('123', '{"id": "123"}')      # asyncio.TimeoutError if no reply
+    '''
+    def __init__(self, url: str, route: Callable[[str], Optional[str]], headers: Optional[Dict] = None, timeout: float = 20.0, idle_timeout: float = 30.0):
+        self.url = url
+        self.route = route
+        self.headers = headers
+        self.timeout = timeout
+        self.idle_timeout = idle_timeout
+        self.socket: Optional[InternetWebsockets] = None
+        self.reader: Optional[asyncio.Task] = None
+        self.lock: Optional[asyncio.Lock] = None
+        self.loop: Optional[asyncio.AbstractEventLoop] = None
+        self.pending: Dict[str, List[asyncio.Future]] = {}
+
+    def detach(self) -> None:
+        ''' Forget the socket of the former event loop, its reader being cancelled if the loop still runs. '''
+        if (self.reader is not None) and not self.reader.done() and (self.loop is not None) and not self.loop.is_closed():
+            self.loop.call_soon_threadsafe(self.reader.cancel)         # The reader closes its socket
+        self.socket = None
+        self.reader = None
+        self.pending = {}
+
+    async def open(self, key: str) -> Tuple[InternetWebsockets, Dict[str, List[asyncio.Future]], asyncio.Future]:
+        ''' Return the connected socket, its pending requests and the future of the reply to the KEY.
+            The future is registered before the reader can close the socket as idle. '''
+        # One lock per event loop
+        loop = asyncio.get_running_loop()
+        if self.loop is not loop:
+            self.detach()
+            self.loop = loop
+            self.lock = asyncio.Lock()
+        assert self.lock is not None
+
+        # Connect once
+        async with self.lock:
+            if (self.socket is None) or (self.socket.ws is None) or self.socket.ws.closed:
+                socket = await InternetWebsockets(self.timeout).connect(self.url, self.headers)
+                self.socket = socket
+                self.pending = {}
+                self.reader = asyncio.create_task(self.read(socket, self.pending))
+            future = loop.create_future()
+            self.pending.setdefault(key, []).append(future)
+            return self.socket, self.pending, future
+
+    async def read(self, socket: InternetWebsockets, pending: Dict[str, List[asyncio.Future]]) -> None:
+        ''' Dispatch the received messages of the SOCKET to its PENDING requests. '''
+        current_deadline.set(InternetDeadline())                    # The reader outlives the download that opened the socket
+        error: BaseException = ConnectionError('Websocket closed')
+        try:
+            while socket.ws is not None:
+                try:
+                    data = await socket.recv(self.idle_timeout)
+                except asyncio.TimeoutError:
+                    if len(pending) == 0:
+                        break
+                    continue
+                if data is None:
+                    break
+                try:
+                    key = self.route(data)
+                except Exception:
+                    key = None
+                for future in pending.pop(key, []) if key is not None else []:
+                    if not future.done():
+                        future.set_result(data)
+        except Exception as exception:
+            error = exception
+        finally:
+            # The next request will reconnect, without waiting for the closure
+            if self.socket is socket:
+                self.socket = None
+                self.pending = {}
+            for futures in pending.values():
+                for future in futures:
+                    if not future.done():
+                        future.set_exception(error)
+            pending.clear()
+            await socket.close()
+
+    async def request(self, key: str, data: str, timeout: Optional[float] = None) -> str:
+        ''' Send the DATA and return the first message routed to the KEY. '''
+        socket, pending, future = await self.open(key)
+        try:
+            await socket.send(data)
+            return await asyncio.wait_for(future, current_deadline.get().timeout(self.timeout if timeout is None else timeout))
+        finally:
+            futures = pending.get(key, [])
+            if future in futures:
+                futures.remove(future)
+                if len(futures) == 0:
+                    del pending[key]
+
+    async def close(self) -> None:
+        ''' Close the socket before the end of the event loop. '''
+        if self.loop is not asyncio.get_running_loop():
+            self.detach()
+            return
+        reader, socket = self.reader, self.socket
+        self.reader = None
+        self.socket = None
+        if reader is not None:
+            reader.cancel()
+            await asyncio.gather(reader, return_exceptions=True)
+        if socket is not None:
+            await socket.close()